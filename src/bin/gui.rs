@@ -83,7 +83,7 @@ fn make_native_options(title: &str) -> eframe::NativeOptions {
 
 fn main() {
     setup_panic_hook();
-    let _log_guard = ibkr_porez::logging::init(false);
+    ibkr_porez::logging::init(false);
 
     #[cfg(target_os = "macos")]
     ibkr_porez::gui::init_notifications();
@@ -16,14 +16,14 @@ pub fn run(
     notes: Option<String>,
     paid: bool,
 ) -> Result<()> {
-    let cfg = load_config_or_exit();
-    let storage = make_storage(&cfg);
-    let manager = DeclarationManager::new(&storage);
-
     let tax = tax.map(validate_non_negative_decimal).transpose()?;
     let gain = gain.map(validate_non_negative_decimal).transpose()?;
     let loss = loss.map(validate_non_negative_decimal).transpose()?;
 
+    let cfg = load_config_or_exit();
+    let storage = make_storage(&cfg);
+    let manager = DeclarationManager::new(&storage);
+
     let input = AssessmentInput {
         assessed_tax_rsd: tax,
         recognized_capital_gain_rsd: gain,
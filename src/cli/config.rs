@@ -70,10 +70,10 @@ pub fn run() -> Result<()> {
     let old_cfg = app_config::load_config();
     let config_path = app_config::config_file_path();
 
-    output::info("Configuration");
-    println!("Config file: {}", style(config_path.display()).dim());
     println!(
-        "Docs: {}\n",
+        "{}\nConfig file: {}\nDocs: {}\n",
+        style("Configuration").blue(),
+        style(config_path.display()).dim(),
         style("https://andgineer.github.io/ibkr-porez/en/usage.html").cyan()
     );
 
@@ -86,9 +86,6 @@ pub fn run() -> Result<()> {
     }
 
     display_current_values(&old_cfg);
-    println!("   A. Update all fields");
-    println!("   Q. Done (save & exit)");
-    println!();
 
     let input: String = Input::new()
         .with_prompt("Select fields to update (comma-separated, 'all', or Enter to skip)")
@@ -138,14 +135,18 @@ fn is_config_empty(cfg: &UserConfig) -> bool {
 }
 
 fn display_current_values(cfg: &UserConfig) {
-    println!("{}", style("Current Configuration:").bold());
+    use std::borrow::Cow;
+    use std::fmt::Write;
+
+    // The field list and the menu under it go out in a single write.
+    let mut out = format!("{}\n", style("Current Configuration:").bold());
     let values = field_values(cfg);
     let issues = app_config::validate_config(cfg);
-    for (i, (fd, val)) in FIELDS.iter().zip(values.iter()).enumerate() {
-        let val_display = if val.is_empty() {
-            style("(not set)").dim().to_string()
+    for (i, (fd, val)) in FIELDS.iter().zip(values).enumerate() {
+        let val_display: Cow<str> = if val.is_empty() {
+            style("(not set)").dim().to_string().into()
         } else {
-            val.clone()
+            val.into()
         };
         let warning = issues
             .iter()
@@ -160,9 +161,15 @@ fn display_current_values(cfg: &UserConfig) {
             })
             .unwrap_or("");
         if suffix.is_empty() {
-            println!("  {:>2}. {}: {val_display}", i + 1, style(fd.label).cyan());
+            let _ = writeln!(
+                out,
+                "  {:>2}. {}: {val_display}",
+                i + 1,
+                style(fd.label).cyan()
+            );
         } else {
-            println!(
+            let _ = writeln!(
+                out,
                 "  {:>2}. {}: {val_display}  {}",
                 i + 1,
                 style(fd.label).cyan(),
@@ -174,64 +181,31 @@ fn display_current_values(cfg: &UserConfig) {
             );
         }
     }
+    out.push_str("   A. Update all fields\n   Q. Done (save & exit)\n\n");
+    print!("{out}");
 }
 
-fn field_values(cfg: &UserConfig) -> Vec<String> {
-    vec![
-        cfg.ibkr_token.clone(),
-        cfg.ibkr_query_id.clone(),
-        cfg.personal_id.clone(),
-        cfg.full_name.clone(),
-        cfg.address.clone(),
-        cfg.city_code.clone(),
-        cfg.phone.clone(),
-        cfg.email.clone(),
-        cfg.data_dir.clone().unwrap_or_default(),
-        cfg.output_folder.clone().unwrap_or_default(),
+fn field_values(cfg: &UserConfig) -> [&str; 10] {
+    [
+        &cfg.ibkr_token,
+        &cfg.ibkr_query_id,
+        &cfg.personal_id,
+        &cfg.full_name,
+        &cfg.address,
+        &cfg.city_code,
+        &cfg.phone,
+        &cfg.email,
+        cfg.data_dir.as_deref().unwrap_or_default(),
+        cfg.output_folder.as_deref().unwrap_or_default(),
     ]
 }
 
 fn prompt_all_fields(old: &UserConfig) -> Result<UserConfig> {
-    let ibkr_token = prompt_text(
-        "IBKR Flex Token (see https://andgineer.github.io/ibkr-porez/en/ibkr.html)",
-        &old.ibkr_token,
-    )?;
-
-    let ibkr_query_id = prompt_text(
-        "IBKR Flex Query ID (see https://andgineer.github.io/ibkr-porez/en/ibkr.html)",
-        &old.ibkr_query_id,
-    )?;
-
-    let personal_id = prompt_text("Personal ID (JMBG)", &old.personal_id)?;
-    let full_name = prompt_text("Full Name (as registered)", &old.full_name)?;
-    let address = prompt_text("Address", &old.address)?;
-    let city_code = prompt_text(
-        "City/Municipality Code (see https://andgineer.github.io/ibkr-porez/en/usage.html)",
-        &old.city_code,
-    )?;
-    let phone = prompt_text("Phone", &old.phone)?;
-    let email = prompt_text("Email", &old.email)?;
-    let data_dir = prompt_optional(
-        "Data Directory (leave empty for default)",
-        old.data_dir.as_ref(),
-    )?;
-    let output_folder = prompt_optional(
-        "Output Folder (leave empty for ~/Downloads)",
-        old.output_folder.as_ref(),
-    )?;
-
-    Ok(UserConfig {
-        ibkr_token,
-        ibkr_query_id,
-        personal_id,
-        full_name,
-        address,
-        city_code,
-        phone,
-        email,
-        data_dir,
-        output_folder,
-    })
+    let mut cfg = old.clone();
+    for idx in 0..FIELDS.len() {
+        prompt_single_field(&mut cfg, idx)?;
+    }
+    Ok(cfg)
 }
 
 fn prompt_single_field(cfg: &mut UserConfig, idx: usize) -> Result<()> {
@@ -249,7 +223,7 @@ fn prompt_single_field(cfg: &mut UserConfig, idx: usize) -> Result<()> {
             )?;
         }
         2 => cfg.personal_id = prompt_text("Personal ID (JMBG)", &cfg.personal_id)?,
-        3 => cfg.full_name = prompt_text("Full Name", &cfg.full_name)?,
+        3 => cfg.full_name = prompt_text("Full Name (as registered)", &cfg.full_name)?,
         4 => cfg.address = prompt_text("Address", &cfg.address)?,
         5 => {
             cfg.city_code = prompt_text(
@@ -259,8 +233,18 @@ fn prompt_single_field(cfg: &mut UserConfig, idx: usize) -> Result<()> {
         }
         6 => cfg.phone = prompt_text("Phone", &cfg.phone)?,
         7 => cfg.email = prompt_text("Email", &cfg.email)?,
-        8 => cfg.data_dir = prompt_optional("Data Directory", cfg.data_dir.as_ref())?,
-        9 => cfg.output_folder = prompt_optional("Output Folder", cfg.output_folder.as_ref())?,
+        8 => {
+            cfg.data_dir = prompt_optional(
+                "Data Directory (leave empty for default)",
+                cfg.data_dir.as_ref(),
+            )?;
+        }
+        9 => {
+            cfg.output_folder = prompt_optional(
+                "Output Folder (leave empty for ~/Downloads)",
+                cfg.output_folder.as_ref(),
+            )?;
+        }
         _ => {}
     }
     Ok(())
@@ -1,4 +1,4 @@
-use std::io::{self, IsTerminal, Write};
+use std::io::{self, BufWriter, IsTerminal};
 use std::path::PathBuf;
 
 use anyhow::Result;
@@ -11,19 +11,37 @@ pub fn run(date: NaiveDate, output_path: Option<String>) -> Result<()> {
     let cfg = load_config_or_exit();
     let storage = make_storage(&cfg);
 
-    let Some(xml) = storage.restore_report(date) else {
+    // Checked before the output file is created, so a missing report does
+    // not leave an empty file behind.
+    if !storage.has_report(date) {
         output::error(&format!("No flex query report found for {date}."));
         return Ok(());
-    };
+    }
 
     let dest = resolve_output(output_path, date, &cfg)?;
 
+    // `false` means the report could not be rebuilt after all (e.g. an
+    // unreadable base); nothing was written in that case.
+    let not_found = || output::error(&format!("No flex query report found for {date}."));
     match dest {
         OutputDest::Stdout => {
-            io::stdout().write_all(xml.as_bytes())?;
+            if !storage.restore_report_to(date, BufWriter::new(io::stdout().lock()))? {
+                not_found();
+            }
         }
         OutputDest::File(path) => {
-            std::fs::write(&path, &xml)?;
+            let file = std::fs::File::create(&path)?;
+            match storage.restore_report_to(date, BufWriter::new(file)) {
+                Ok(true) => {}
+                restored => {
+                    // Don't leave the empty or partial file we just created
+                    // behind, whether the report was missing or failed.
+                    let _ = std::fs::remove_file(&path);
+                    restored?;
+                    not_found();
+                    return Ok(());
+                }
+            }
             let abs = std::fs::canonicalize(&path).unwrap_or(path);
             output::success(&format!("Exported flex query saved to: {}", abs.display()));
         }
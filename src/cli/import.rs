@@ -1,34 +1,30 @@
-use std::io::{self, IsTerminal, Read};
+use std::fs::File;
+use std::io::{self, IsTerminal};
 use std::path::PathBuf;
 
-use anyhow::{Result, bail};
+use anyhow::{Context, Result, bail};
 
 use super::{init_calendar, load_config_or_exit, make_nbs, make_storage, output};
 use ibkr_porez::import;
 
 #[allow(clippy::needless_pass_by_value)]
 pub fn run(file_path: Option<PathBuf>) -> Result<()> {
+    let source = resolve_input(file_path)?;
+
     let cfg = load_config_or_exit();
     let storage = make_storage(&cfg);
     let cal = init_calendar(&cfg);
     let nbs = make_nbs(&storage, &cal);
-
-    let source = resolve_input(file_path)?;
     let label = match &source {
         InputSource::Stdin => "stdin",
-        InputSource::File(p) => p.to_str().unwrap_or("file"),
+        InputSource::File(p, _) => p.to_str().unwrap_or("file"),
     };
     output::info(&format!("Importing from {label}..."));
     let sp = output::spinner("Processing import...");
 
-    let result = match &source {
-        InputSource::Stdin => {
-            let mut buf = Vec::new();
-            io::stdin().read_to_end(&mut buf)?;
-            let cursor = io::Cursor::new(buf);
-            import::import_from_reader(&storage, &nbs, cursor)
-        }
-        InputSource::File(path) => import::import_from_file(&storage, &nbs, path),
+    let result = match source {
+        InputSource::Stdin => import::import_from_reader(&storage, &nbs, io::stdin().lock()),
+        InputSource::File(_, file) => import::import_from_reader(&storage, &nbs, file),
     };
 
     sp.finish_and_clear();
@@ -54,7 +50,9 @@ pub fn run(file_path: Option<PathBuf>) -> Result<()> {
 
 enum InputSource {
     Stdin,
-    File(PathBuf),
+    /// Opened while resolving, so there is no separate existence check
+    /// that could race with (or repeat) the open.
+    File(PathBuf, File),
 }
 
 fn resolve_input(file_path: Option<PathBuf>) -> Result<InputSource> {
@@ -68,14 +66,15 @@ fn resolve_input(file_path: Option<PathBuf>) -> Result<InputSource> {
             Ok(InputSource::Stdin)
         }
         Some(p) if p.to_str() == Some("-") => Ok(InputSource::Stdin),
-        Some(p) => {
-            if p.exists() {
-                Ok(InputSource::File(p))
-            } else if !io::stdin().is_terminal() {
+        Some(p) => match File::open(&p) {
+            Ok(file) => Ok(InputSource::File(p, file)),
+            Err(e) if e.kind() == io::ErrorKind::NotFound => {
+                if io::stdin().is_terminal() {
+                    bail!("file not found: {}", p.display());
+                }
                 Ok(InputSource::Stdin)
-            } else {
-                bail!("file not found: {}", p.display());
             }
-        }
+            Err(e) => Err(e).with_context(|| format!("cannot open file: {}", p.display())),
+        },
     }
 }
@@ -1,10 +1,12 @@
+use std::io::{BufWriter, Write};
+
 use anyhow::Result;
 use console::style;
 
 use super::{StatusFilter, load_config_or_exit, make_storage, tables};
 use ibkr_porez::list::{self, ListOptions};
 
-#[allow(clippy::needless_pass_by_value, clippy::unnecessary_wraps)]
+#[allow(clippy::needless_pass_by_value)]
 pub fn run(all: bool, status: Option<StatusFilter>, ids_only: bool) -> Result<()> {
     let cfg = load_config_or_exit();
     let storage = make_storage(&cfg);
@@ -16,9 +18,13 @@ pub fn run(all: bool, status: Option<StatusFilter>, ids_only: bool) -> Result<()
     let declarations = list::list_declarations(&storage, &options);
 
     if ids_only {
+        // Plain, unstyled output meant for `| xargs`: take the stdout lock
+        // once and buffer instead of a locked, flushed write per line.
+        let mut out = BufWriter::new(std::io::stdout().lock());
         for d in &declarations {
-            println!("{}", d.declaration_id);
+            writeln!(out, "{}", d.declaration_id)?;
         }
+        out.flush()?;
         return Ok(());
     }
 
@@ -21,7 +21,7 @@ pub mod tables;
 use std::hash::{DefaultHasher, Hash, Hasher};
 use std::io::{BufRead, IsTerminal};
 
-use anyhow::{Result, bail};
+use anyhow::{Context, Result, bail};
 use chrono::{Datelike, Local, NaiveDate};
 use rust_decimal::Decimal;
 
@@ -161,7 +161,7 @@ pub(crate) fn resolve_ids(args: Vec<String>) -> Vec<String> {
 
 pub(crate) fn run_bulk<F>(args: Vec<String>, op: F) -> Result<()>
 where
-    F: FnMut(&DeclarationManager<'_>, &str) -> Result<()>,
+    F: FnMut(&DeclarationManager<'_>, &str) -> Result<String>,
 {
     let ids = resolve_ids(args);
     run_bulk_resolved(&ids, op)
@@ -169,7 +169,29 @@ where
 
 pub(crate) fn run_bulk_resolved<F>(ids: &[String], op: F) -> Result<()>
 where
-    F: FnMut(&DeclarationManager<'_>, &str) -> Result<()>,
+    F: FnMut(&DeclarationManager<'_>, &str) -> Result<String>,
+{
+    run_bulk_in(ids, true, op)
+}
+
+/// Like [`run_bulk_resolved`], but every ID is written to disk as it is
+/// processed. For operations that also update `capital_losses.json` (revert,
+/// assessment): that file is written immediately, so deferring the matching
+/// `declarations.json` change to the end of a batch could leave the two out
+/// of step if the final write failed.
+pub(crate) fn run_bulk_unbatched<F>(ids: &[String], op: F) -> Result<()>
+where
+    F: FnMut(&DeclarationManager<'_>, &str) -> Result<String>,
+{
+    run_bulk_in(ids, false, op)
+}
+
+/// `op` returns the success line for its ID. The lines are printed only
+/// once the batch (if any) has been written, so a failed final write never
+/// follows a report of changes that were not saved.
+fn run_bulk_in<F>(ids: &[String], batched: bool, mut op: F) -> Result<()>
+where
+    F: FnMut(&DeclarationManager<'_>, &str) -> Result<String>,
 {
     if ids.is_empty() {
         bail!("no declaration IDs provided");
@@ -178,7 +200,23 @@ where
     let storage = make_storage(&cfg);
     let manager = DeclarationManager::new(&storage);
     let id_refs: Vec<&str> = ids.iter().map(String::as_str).collect();
-    let result = manager.apply_each(&id_refs, op);
+    let mut done = Vec::new();
+    let apply = || {
+        manager.apply_each(&id_refs, |m, id| {
+            done.push(op(m, id)?);
+            Ok(())
+        })
+    };
+    let result = if batched {
+        storage
+            .with_declarations_batch(apply)
+            .with_context(|| storage.io_error_hint())?
+    } else {
+        apply()
+    };
+    for msg in &done {
+        output::success(msg);
+    }
     report_bulk_result(&result)
 }
 
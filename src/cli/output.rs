@@ -69,17 +69,17 @@ fn insert_thousands_separator(s: &str) -> String {
     let negative = integer.starts_with('-');
     let digits = if negative { &integer[1..] } else { integer };
 
-    let mut result = String::new();
-    for (i, ch) in digits.chars().rev().enumerate() {
-        if i > 0 && i % 3 == 0 {
-            result.push(',');
-        }
-        result.push(ch);
-    }
-
-    let mut out = result.chars().rev().collect::<String>();
+    // One forward pass into a pre-sized buffer. `digits` is ASCII, so
+    // byte offsets are digit positions.
+    let mut out = String::with_capacity(s.len() + digits.len() / 3);
     if negative {
-        out.insert(0, '-');
+        out.push('-');
+    }
+    for (i, ch) in digits.char_indices() {
+        if i > 0 && (digits.len() - i) % 3 == 0 {
+            out.push(',');
+        }
+        out.push(ch);
     }
     if let Some(dec) = decimal {
         out.push_str(dec);
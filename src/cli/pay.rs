@@ -1,7 +1,7 @@
 use anyhow::{Result, bail};
 use rust_decimal::Decimal;
 
-use super::{output, resolve_ids, run_bulk, run_bulk_resolved, validate_non_negative_decimal};
+use super::{resolve_ids, run_bulk, run_bulk_unbatched, validate_non_negative_decimal};
 use ibkr_porez::declaration_manager::AssessmentInput;
 
 pub fn run(declaration_id: Vec<String>, tax: Option<Decimal>) -> Result<()> {
@@ -11,21 +11,19 @@ pub fn run(declaration_id: Vec<String>, tax: Option<Decimal>) -> Result<()> {
         if ids.len() > 1 {
             bail!("--tax can only be used with a single declaration ID");
         }
-        return run_bulk_resolved(&ids, |m, id| {
+        return run_bulk_unbatched(&ids, |m, id| {
             let input = AssessmentInput {
                 assessed_tax_rsd: Some(amount),
                 mark_paid: true,
                 ..Default::default()
             };
             m.record_assessment(id, &input)?;
-            output::success(&format!("Paid: {id} ({amount:.2} RSD recorded)"));
-            Ok(())
+            Ok(format!("Paid: {id} ({amount:.2} RSD recorded)"))
         });
     }
 
     run_bulk(declaration_id, |m, id| {
         m.pay(&[id])?;
-        output::success(&format!("Paid: {id}"));
-        Ok(())
+        Ok(format!("Paid: {id}"))
     })
 }
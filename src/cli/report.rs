@@ -201,9 +201,7 @@ fn run_income(
                         dest.display(),
                         report.entries.len(),
                     ));
-                    for entry in &report.entries {
-                        tables::print_income_entry(entry);
-                    }
+                    tables::print_income_entries(&report.entries);
                     written += 1;
                 }
                 // Running out of holiday data is not a per-group problem:
@@ -1,20 +1,19 @@
 use anyhow::Result;
 
-use super::{output, run_bulk};
+use super::{resolve_ids, run_bulk_unbatched};
 use crate::RevertTarget;
 
 #[allow(clippy::needless_pass_by_value)]
 pub fn run(declaration_id: Vec<String>, to: RevertTarget) -> Result<()> {
-    run_bulk(declaration_id, |m, id| match to {
+    let ids = resolve_ids(declaration_id);
+    run_bulk_unbatched(&ids, |m, id| match to {
         RevertTarget::Draft => {
             m.revert(&[id])?;
-            output::success(&format!("Reverted {id} to draft"));
-            Ok(())
+            Ok(format!("Reverted {id} to draft"))
         }
         RevertTarget::Submitted => {
             m.submit(&[id])?;
-            output::success(&format!("Submitted: {id}"));
-            Ok(())
+            Ok(format!("Submitted: {id}"))
         }
     })
 }
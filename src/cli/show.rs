@@ -5,7 +5,6 @@ use comfy_table::{Cell, Color, Table};
 use console::style;
 
 use super::{load_config_or_exit, make_storage, output, tables};
-use ibkr_porez::models::{DeclarationType, IncomeDeclarationEntry, TaxReportEntry};
 
 #[allow(clippy::unnecessary_wraps)]
 pub fn run(declaration_id: &str) -> Result<()> {
@@ -48,29 +47,7 @@ pub fn run(declaration_id: &str) -> Result<()> {
         println!("{} {fp}", style("File:").bold());
     }
 
-    if let Some(ref data) = decl.report_data {
-        if decl.r#type == DeclarationType::Ppdg3r {
-            let entries: Vec<TaxReportEntry> = data
-                .iter()
-                .filter_map(|v| serde_json::from_value(v.clone()).ok())
-                .collect();
-            if !entries.is_empty() {
-                println!("\n  Declaration Data (Part 4)");
-                println!("{}", tables::render_gains_table(&entries));
-            }
-        } else {
-            let entries: Vec<IncomeDeclarationEntry> = data
-                .iter()
-                .filter_map(|v| serde_json::from_value(v.clone()).ok())
-                .collect();
-            if !entries.is_empty() {
-                println!();
-                for entry in &entries {
-                    tables::print_income_entry(entry);
-                }
-            }
-        }
-    }
+    tables::print_report_data(&decl);
 
     if !decl.metadata.is_empty() {
         print_metadata(&decl.metadata);
@@ -132,7 +109,7 @@ fn print_metadata(metadata: &indexmap::IndexMap<String, serde_json::Value>) {
     let mut extras: Vec<&str> = metadata
         .keys()
         .map(String::as_str)
-        .filter(|k| *k != CARRYFORWARD_SOURCES_KEY && !ordered_keys.contains(k))
+        .filter(|k| *k != CARRYFORWARD_SOURCES_KEY && !METADATA_KEY_ORDER.contains(k))
         .collect();
     extras.sort_unstable();
     ordered_keys.extend(extras);
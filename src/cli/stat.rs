@@ -7,6 +7,10 @@ use console::style;
 use super::{init_calendar, load_config_or_exit, make_nbs, make_storage, output};
 use ibkr_porez::stat::{ShowStatistics, StatMode};
 
+/// Rows shown in the monthly breakdown before the rest is summarised.
+/// Rows arrive newest month first, so the cap keeps the most recent data.
+const MAX_AGGREGATED_ROWS: usize = 500;
+
 #[allow(clippy::needless_pass_by_value, clippy::too_many_lines)]
 pub fn run(year: Option<i32>, ticker: Option<String>, month: Option<String>) -> Result<()> {
     let cfg = load_config_or_exit();
@@ -47,9 +51,10 @@ pub fn run(year: Option<i32>, ticker: Option<String>, month: Option<String>) ->
                     Cell::new("Realized P/L (RSD)").fg(Color::Cyan),
                 ]);
 
-            let mut prev_month: Option<String> = None;
-            for row in &rows {
-                if prev_month.as_ref().is_some_and(|pm| pm != &row.month) {
+            let shown = &rows[..rows.len().min(MAX_AGGREGATED_ROWS)];
+            let mut prev_month: Option<&str> = None;
+            for row in shown {
+                if prev_month.is_some_and(|pm| pm != row.month) {
                     table.add_row(vec![
                         Cell::new(""),
                         Cell::new(""),
@@ -58,7 +63,7 @@ pub fn run(year: Option<i32>, ticker: Option<String>, month: Option<String>) ->
                         Cell::new(""),
                     ]);
                 }
-                prev_month = Some(row.month.clone());
+                prev_month = Some(&row.month);
 
                 table.add_row(vec![
                     Cell::new(&row.month),
@@ -70,6 +75,12 @@ pub fn run(year: Option<i32>, ticker: Option<String>, month: Option<String>) ->
             }
 
             println!("{table}");
+            let hidden = rows.len() - shown.len();
+            if hidden > 0 {
+                output::dim(&format!(
+                    "... {hidden} more rows hidden; narrow with --year or --month"
+                ));
+            }
         }
         StatMode::Detailed {
             rows,
@@ -98,13 +109,13 @@ pub fn run(year: Option<i32>, ticker: Option<String>, month: Option<String>) ->
             for row in &rows {
                 table.add_row(vec![
                     Cell::new(&row.sale_date),
-                    Cell::new(format!("{:.2}", row.quantity)),
-                    Cell::new(format!("{:.2}", row.sale_price)),
-                    Cell::new(format!("{:.4}", row.sale_rate)),
+                    Cell::new(format_args!("{:.2}", row.quantity)),
+                    Cell::new(format_args!("{:.2}", row.sale_price)),
+                    Cell::new(format_args!("{:.4}", row.sale_rate)),
                     Cell::new(output::format_thousands_0f(row.sale_value_rsd)),
                     Cell::new(&row.buy_date),
-                    Cell::new(format!("{:.2}", row.buy_price)),
-                    Cell::new(format!("{:.4}", row.buy_rate)),
+                    Cell::new(format_args!("{:.2}", row.buy_price)),
+                    Cell::new(format_args!("{:.4}", row.buy_rate)),
                     Cell::new(output::format_thousands_0f(row.buy_value_rsd)),
                     Cell::new(output::format_thousands_2f(row.gain_rsd))
                         .add_attribute(Attribute::Bold),
@@ -1,7 +1,7 @@
 use anyhow::{Result, bail};
 use ibkr_porez::models::DeclarationStatus;
 
-use super::{output, resolve_ids, run_bulk_resolved};
+use super::{resolve_ids, run_bulk_resolved};
 
 #[allow(clippy::needless_pass_by_value)]
 pub fn run(declaration_id: Vec<String>, number: Option<String>) -> Result<()> {
@@ -15,7 +15,7 @@ pub fn run(declaration_id: Vec<String>, number: Option<String>) -> Result<()> {
 
     run_bulk_resolved(&ids, |m, id| {
         m.submit_with_number(&[id], number.as_deref())?;
-        let msg = match m.get_status(id) {
+        Ok(match m.get_status(id) {
             Some(DeclarationStatus::Finalized) => {
                 format!("Finalized: {id} (no tax to pay)")
             }
@@ -25,8 +25,6 @@ pub fn run(declaration_id: Vec<String>, number: Option<String>) -> Result<()> {
             _ => {
                 format!("Submitted: {id}")
             }
-        };
-        output::success(&msg);
-        Ok(())
+        })
     })
 }
@@ -5,7 +5,7 @@ use anyhow::{Result, bail};
 
 use super::{init_calendar_with_sync, load_config_or_exit, make_nbs, make_storage, output, tables};
 use ibkr_porez::ibkr_flex::IBKRClient;
-use ibkr_porez::models::{Declaration, DeclarationType, IncomeDeclarationEntry, TaxReportEntry};
+use ibkr_porez::models::Declaration;
 use ibkr_porez::storage::Storage;
 use ibkr_porez::sync::SyncResult;
 use ibkr_porez::sync::{SyncOptions, run_sync, run_sync_from_file, run_sync_from_xml};
@@ -16,6 +16,13 @@ pub fn run(
     lookback: Option<i64>,
     file: Option<PathBuf>,
 ) -> Result<()> {
+    // Refuse a terminal stdin before config, storage and the holiday
+    // calendar (which may go to the network) are set up.
+    let from_stdin = file.as_deref().and_then(|p| p.to_str()) == Some("-");
+    if from_stdin && io::stdin().is_terminal() {
+        bail!("--file - requires piped input (stdin is a terminal)");
+    }
+
     let mut cfg = load_config_or_exit();
 
     if let Some(ref out) = output_dir {
@@ -33,12 +40,9 @@ pub fn run(
 
     let result = if let Some(ref path) = file {
         let sp = output::spinner("Importing from file and creating declarations...");
-        let sync_result = if path.to_str() == Some("-") {
-            if io::stdin().is_terminal() {
-                bail!("--file - requires piped input (stdin is a terminal)");
-            }
+        let sync_result = if from_stdin {
             let mut xml = String::new();
-            io::stdin().read_to_string(&mut xml)?;
+            io::stdin().lock().read_to_string(&mut xml)?;
             run_sync_from_xml(&xml, &storage, &nbs, &cfg, &cal, &options)
         } else {
             run_sync_from_file(path, &storage, &nbs, &cfg, &cal, &options)
@@ -140,28 +144,7 @@ fn print_sync_result(result: &SyncResult, storage: &Storage) {
             ));
             print_amendment_hint(decl, storage);
 
-            if let Some(ref data) = decl.report_data {
-                if decl.r#type == DeclarationType::Ppdg3r {
-                    let entries: Vec<TaxReportEntry> = data
-                        .iter()
-                        .filter_map(|v| serde_json::from_value::<TaxReportEntry>(v.clone()).ok())
-                        .collect();
-                    if !entries.is_empty() {
-                        println!("\n  Declaration Data (Part 4)");
-                        println!("{}", tables::render_gains_table(&entries));
-                    }
-                } else {
-                    let entries: Vec<IncomeDeclarationEntry> = data
-                        .iter()
-                        .filter_map(|v| {
-                            serde_json::from_value::<IncomeDeclarationEntry>(v.clone()).ok()
-                        })
-                        .collect();
-                    for entry in &entries {
-                        tables::print_income_entry(entry);
-                    }
-                }
-            }
+            tables::print_report_data(decl);
         }
     }
 
@@ -188,7 +171,9 @@ mod tests {
     use super::*;
 
     use chrono::NaiveDate;
-    use ibkr_porez::models::DeclarationStatus;
+    use ibkr_porez::models::{
+        DeclarationStatus, DeclarationType, IncomeDeclarationEntry, TaxReportEntry,
+    };
 
     fn tmp_storage() -> (tempfile::TempDir, Storage) {
         let tmp = tempfile::TempDir::new().unwrap();
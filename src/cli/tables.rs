@@ -2,9 +2,11 @@ use comfy_table::modifiers::UTF8_ROUND_CORNERS;
 use comfy_table::presets::UTF8_FULL;
 use comfy_table::{Attribute, Cell, Color, ContentArrangement, Table};
 use rust_decimal::Decimal;
+use serde::Deserialize;
 
 use ibkr_porez::models::{
-    CarryforwardStatus, CarryforwardVintage, IncomeDeclarationEntry, TaxReportEntry,
+    CarryforwardStatus, CarryforwardVintage, Declaration, DeclarationType, IncomeDeclarationEntry,
+    TaxReportEntry,
 };
 
 pub fn render_gains_table(entries: &[TaxReportEntry]) -> Table {
@@ -39,10 +41,10 @@ pub fn render_gains_table(entries: &[TaxReportEntry]) -> Table {
             Cell::new(i + 1),
             Cell::new(&entry.ticker),
             Cell::new(entry.sale_date.format("%Y-%m-%d")),
-            Cell::new(format!("{:.4}", entry.quantity)),
-            Cell::new(format!("{:.2}", entry.sale_value_rsd)),
+            Cell::new(format_args!("{:.4}", entry.quantity)),
+            Cell::new(format_args!("{:.2}", entry.sale_value_rsd)),
             Cell::new(entry.purchase_date.format("%Y-%m-%d")),
-            Cell::new(format!("{:.2}", entry.purchase_value_rsd)),
+            Cell::new(format_args!("{:.2}", entry.purchase_value_rsd)),
             Cell::new(&gain).fg(Color::Green),
             Cell::new(&loss).fg(Color::Red),
         ]);
@@ -51,10 +53,24 @@ pub fn render_gains_table(entries: &[TaxReportEntry]) -> Table {
     table
 }
 
-pub fn print_income_entry(entry: &IncomeDeclarationEntry) {
+/// Print income entries with a single write to stdout instead of one
+/// line-buffered write per entry.
+pub fn print_income_entries(entries: &[IncomeDeclarationEntry]) {
+    let mut out = String::new();
+    for entry in entries {
+        write_income_entry(&mut out, entry);
+    }
+    print!("{out}");
+}
+
+/// Append one formatted income entry line to `out`.
+fn write_income_entry(out: &mut String, entry: &IncomeDeclarationEntry) {
     use console::style;
+    use std::fmt::Write;
 
-    println!(
+    // Writing into a `String` cannot fail.
+    let _ = writeln!(
+        out,
         "  {} {} | {} | Bruto: {:.2} | Osnovica: {:.2} | Porez: {:.2} | Placen: {:.2} | Za uplatu: {:.2}",
         style(entry.date.format("%Y-%m-%d")).cyan(),
         entry.symbol_or_currency.as_deref().unwrap_or("-"),
@@ -67,7 +83,39 @@ pub fn print_income_entry(entry: &IncomeDeclarationEntry) {
     );
 }
 
-pub fn render_declarations_table(declarations: &[ibkr_porez::models::Declaration]) -> Table {
+/// Print a declaration's `report_data` rows in the form its type calls for.
+///
+/// Rows are deserialized from the borrowed JSON values; any that do not fit
+/// the declaration's entry type are skipped.
+pub fn print_report_data(decl: &Declaration) {
+    let Some(data) = decl.report_data.as_deref() else {
+        return;
+    };
+    match decl.r#type {
+        DeclarationType::Ppdg3r => {
+            let entries: Vec<TaxReportEntry> = data
+                .iter()
+                .filter_map(|v| TaxReportEntry::deserialize(v).ok())
+                .collect();
+            if !entries.is_empty() {
+                println!("\n  Declaration Data (Part 4)");
+                println!("{}", render_gains_table(&entries));
+            }
+        }
+        DeclarationType::Ppo => {
+            let entries: Vec<IncomeDeclarationEntry> = data
+                .iter()
+                .filter_map(|v| IncomeDeclarationEntry::deserialize(v).ok())
+                .collect();
+            if !entries.is_empty() {
+                println!();
+                print_income_entries(&entries);
+            }
+        }
+    }
+}
+
+pub fn render_declarations_table(declarations: &[Declaration]) -> Table {
     let mut table = Table::new();
     table
         .load_preset(UTF8_FULL)
@@ -83,19 +131,9 @@ pub fn render_declarations_table(declarations: &[ibkr_porez::models::Declaration
             Cell::new("Attachments").fg(Color::Cyan),
         ]);
 
+    // Cells take anything `Display`, so the formatted columns are written
+    // straight into the cell instead of through an intermediate `String`.
     for decl in declarations {
-        let type_str = match decl.r#type {
-            ibkr_porez::models::DeclarationType::Ppdg3r => "PPDG-3R",
-            ibkr_porez::models::DeclarationType::Ppo => "PP OPO",
-        };
-        let period = format!(
-            "{} - {}",
-            decl.period_start.format("%Y-%m-%d"),
-            decl.period_end.format("%Y-%m-%d"),
-        );
-        let tax = tax_from_metadata(decl);
-        let status_str = decl.status.to_string();
-        let created = decl.created_at.format("%Y-%m-%d %H:%M").to_string();
         let attachments = if decl.attached_files.is_empty() {
             String::new()
         } else {
@@ -104,12 +142,17 @@ pub fn render_declarations_table(declarations: &[ibkr_porez::models::Declaration
 
         table.add_row(vec![
             Cell::new(&decl.declaration_id).fg(Color::Cyan),
-            Cell::new(type_str).fg(Color::Magenta),
-            Cell::new(&period).fg(Color::Green),
-            Cell::new(&tax),
-            Cell::new(&status_str).fg(Color::Yellow),
-            Cell::new(&created).fg(Color::Blue),
-            Cell::new(&attachments).add_attribute(Attribute::Dim),
+            Cell::new(decl.display_type()).fg(Color::Magenta),
+            Cell::new(format_args!(
+                "{} - {}",
+                decl.period_start.format("%Y-%m-%d"),
+                decl.period_end.format("%Y-%m-%d"),
+            ))
+            .fg(Color::Green),
+            Cell::new(tax_from_metadata(decl)),
+            Cell::new(decl.status.as_str()).fg(Color::Yellow),
+            Cell::new(decl.created_at.format("%Y-%m-%d %H:%M")).fg(Color::Blue),
+            Cell::new(attachments).add_attribute(Attribute::Dim),
         ]);
     }
 
@@ -147,8 +190,8 @@ pub fn render_carryforward_table(vintages: &[CarryforwardVintage], current_year:
         table.add_row(vec![
             Cell::new(&v.id).fg(Color::Cyan),
             Cell::new(&period).fg(Color::Green),
-            Cell::new(format!("{:.2}", v.recognized_loss_rsd)),
-            Cell::new(format!("{:.2}", v.remaining_loss_rsd)),
+            Cell::new(format_args!("{:.2}", v.recognized_loss_rsd)),
+            Cell::new(format_args!("{:.2}", v.remaining_loss_rsd)),
             Cell::new(v.expiration_tax_year),
             Cell::new(status.to_string()).fg(color),
         ]);
@@ -157,25 +200,15 @@ pub fn render_carryforward_table(vintages: &[CarryforwardVintage], current_year:
     table
 }
 
-fn tax_from_metadata(decl: &ibkr_porez::models::Declaration) -> String {
-    if let Some(v) = decl
-        .metadata
-        .get("assessed_tax_due_rsd")
-        .and_then(|v| v.as_str())
-    {
-        return v.to_string();
-    }
-    if let Some(v) = decl.metadata.get("tax_due_rsd").and_then(|v| v.as_str()) {
-        return v.to_string();
-    }
-    String::new()
+fn tax_from_metadata(decl: &ibkr_porez::models::Declaration) -> &str {
+    decl.tax_metadata().map_or("", |(tax, _)| tax)
 }
 
 #[cfg(test)]
 mod tests {
     use super::*;
     use chrono::NaiveDate;
-    use ibkr_porez::models::{Declaration, DeclarationStatus, DeclarationType};
+    use ibkr_porez::models::DeclarationStatus;
     use indexmap::IndexMap;
     use rust_decimal_macros::dec;
 
@@ -223,7 +256,7 @@ mod tests {
     }
 
     #[test]
-    fn print_income_entry_does_not_panic() {
+    fn print_income_entries_does_not_panic() {
         let entry = IncomeDeclarationEntry {
             date: NaiveDate::from_ymd_opt(2025, 4, 14).unwrap(),
             symbol_or_currency: Some("AAPL".into()),
@@ -235,11 +268,11 @@ mod tests {
             porez_za_uplatu: dec!(0),
         };
         // Writes to stdout; we verify it doesn't panic and produces output
-        print_income_entry(&entry);
+        print_income_entries(&[entry]);
     }
 
     #[test]
-    fn print_income_entry_none_symbol() {
+    fn print_income_entries_none_symbol() {
         let entry = IncomeDeclarationEntry {
             date: NaiveDate::from_ymd_opt(2025, 4, 14).unwrap(),
             symbol_or_currency: None,
@@ -250,7 +283,7 @@ mod tests {
             porez_placen_drugoj_drzavi: dec!(15),
             porez_za_uplatu: dec!(0),
         };
-        print_income_entry(&entry);
+        print_income_entries(&[entry]);
     }
 
     fn make_test_decl(metadata: IndexMap<String, serde_json::Value>) -> Declaration {
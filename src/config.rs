@@ -1,4 +1,6 @@
-use std::path::PathBuf;
+use std::hash::{DefaultHasher, Hash, Hasher};
+use std::path::{Path, PathBuf};
+use std::sync::{LazyLock, Mutex, MutexGuard, PoisonError};
 
 use anyhow::Result;
 
@@ -49,12 +51,23 @@ pub fn config_file_path() -> PathBuf {
     config_dir().join(CONFIG_FILENAME)
 }
 
-#[must_use]
-pub fn get_default_data_dir_path() -> PathBuf {
+// The platform lookups behind these probe env vars (and, on Windows and
+// macOS, the OS) every time; the answer cannot change within a run.
+static DEFAULT_DATA_DIR: LazyLock<PathBuf> = LazyLock::new(|| {
     dirs::data_dir()
         .unwrap_or_else(|| PathBuf::from("."))
         .join(APP_NAME)
         .join(DATA_SUBDIR)
+});
+static DEFAULT_OUTPUT_DIR: LazyLock<PathBuf> = LazyLock::new(|| {
+    dirs::home_dir()
+        .unwrap_or_else(|| PathBuf::from("."))
+        .join("Downloads")
+});
+
+#[must_use]
+pub fn get_default_data_dir_path() -> PathBuf {
+    DEFAULT_DATA_DIR.clone()
 }
 
 #[must_use]
@@ -73,9 +86,7 @@ pub fn get_effective_data_dir_path(config: &UserConfig) -> PathBuf {
 
 #[must_use]
 pub fn get_default_output_dir_path() -> PathBuf {
-    dirs::home_dir()
-        .unwrap_or_else(|| PathBuf::from("."))
-        .join("Downloads")
+    DEFAULT_OUTPUT_DIR.clone()
 }
 
 #[must_use]
@@ -88,6 +99,10 @@ pub fn get_effective_output_dir_path(config: &UserConfig) -> PathBuf {
 
 #[must_use]
 pub fn get_data_dir_change_warning(old: &UserConfig, new: &UserConfig) -> Option<String> {
+    // Most edits leave the field untouched; skip resolving both paths.
+    if old.data_dir == new.data_dir {
+        return None;
+    }
     let old_path = get_effective_data_dir_path(old);
     let new_path = get_effective_data_dir_path(new);
     if old_path == new_path {
@@ -104,15 +119,50 @@ pub fn get_data_dir_change_warning(old: &UserConfig, new: &UserConfig) -> Option
 // Config load / save
 // ---------------------------------------------------------------------------
 
+/// Last config read or written, keyed by a hash of the file's content at
+/// that point. A later load re-parses only if the content changed since, so
+/// repeated loads (CLI helpers, every GUI refresh) cost one small read and
+/// no JSON parse. The content is hashed rather than trusting mtime and size:
+/// a same-width edit by another process within the filesystem's mtime
+/// granularity would leave both unchanged.
+struct CachedConfig {
+    path: PathBuf,
+    hash: Option<u64>,
+    config: UserConfig,
+}
+
+static CONFIG_CACHE: Mutex<Option<CachedConfig>> = Mutex::new(None);
+
+fn content_hash(content: &str) -> u64 {
+    let mut hasher = DefaultHasher::new();
+    content.hash(&mut hasher);
+    hasher.finish()
+}
+
+fn lock_config_cache() -> MutexGuard<'static, Option<CachedConfig>> {
+    CONFIG_CACHE.lock().unwrap_or_else(PoisonError::into_inner)
+}
+
 #[must_use]
-pub fn load_config_from(path: &std::path::Path) -> UserConfig {
-    if !path.exists() {
-        return UserConfig::default();
-    }
-    match std::fs::read_to_string(path) {
-        Ok(content) => serde_json::from_str(&content).unwrap_or_default(),
-        Err(_) => UserConfig::default(),
-    }
+pub fn load_config_from(path: &Path) -> UserConfig {
+    let content = std::fs::read_to_string(path).ok();
+    let hash = content.as_deref().map(content_hash);
+    let mut cache = lock_config_cache();
+    if let Some(cached) = cache.as_ref()
+        && cached.path == path
+        && cached.hash == hash
+    {
+        return cached.config.clone();
+    }
+    let config = content
+        .and_then(|c| serde_json::from_str(&c).ok())
+        .unwrap_or_default();
+    *cache = Some(CachedConfig {
+        path: path.to_path_buf(),
+        hash,
+        config: config.clone(),
+    });
+    config
 }
 
 #[must_use]
@@ -126,7 +176,12 @@ pub fn save_config(config: &UserConfig) -> Result<()> {
         std::fs::create_dir_all(parent)?;
     }
     let json = serde_json::to_string_pretty(config)?;
-    std::fs::write(&path, json)?;
+    std::fs::write(&path, &json)?;
+    *lock_config_cache() = Some(CachedConfig {
+        path,
+        hash: Some(content_hash(&json)),
+        config: config.clone(),
+    });
     Ok(())
 }
 
@@ -372,6 +427,26 @@ mod tests {
         assert_eq!(cfg.ibkr_query_id, "qid");
     }
 
+    #[test]
+    fn load_config_from_picks_up_rewritten_file() {
+        let tmp = tempfile::NamedTempFile::new().unwrap();
+        std::fs::write(tmp.path(), r#"{"ibkr_token":"tok"}"#).unwrap();
+        assert_eq!(load_config_from(tmp.path()).ibkr_token, "tok");
+        std::fs::write(tmp.path(), r#"{"ibkr_token":"token2"}"#).unwrap();
+        assert_eq!(load_config_from(tmp.path()).ibkr_token, "token2");
+    }
+
+    #[test]
+    fn load_config_from_picks_up_same_length_rewrite() {
+        // Same size and, on a coarse-mtime filesystem, the same mtime: only
+        // the content tells the two versions apart.
+        let tmp = tempfile::NamedTempFile::new().unwrap();
+        std::fs::write(tmp.path(), r#"{"ibkr_token":"tok1"}"#).unwrap();
+        assert_eq!(load_config_from(tmp.path()).ibkr_token, "tok1");
+        std::fs::write(tmp.path(), r#"{"ibkr_token":"tok2"}"#).unwrap();
+        assert_eq!(load_config_from(tmp.path()).ibkr_token, "tok2");
+    }
+
     #[test]
     fn load_config_from_invalid_json_returns_default() {
         let tmp = tempfile::NamedTempFile::new().unwrap();
@@ -6,6 +6,7 @@ use rust_decimal::Decimal;
 use crate::due_date::next_working_day;
 use crate::holidays::HolidayCalendar;
 use crate::models::{PriorRecognizedLoss, TaxReportEntry, UserConfig};
+use crate::tax::TAX_RATE;
 
 #[must_use]
 #[allow(clippy::missing_panics_doc)]
@@ -31,7 +32,7 @@ pub fn generate_gains_xml(
     let prior_total: Decimal = prior_losses.iter().map(|p| p.remaining_loss_rsd).sum();
     let prior_used = base.min(prior_total);
     let osnovica = base - prior_used;
-    let porez = (osnovica * Decimal::new(15, 2)).round_dp(2);
+    let porez = (osnovica * TAX_RATE).round_dp(2);
 
     let mut buf = Vec::new();
     let mut w = Writer::new_with_indent(&mut buf, b' ', 2);
@@ -5,7 +5,9 @@ use chrono::{Datelike, Local, NaiveDate};
 use rust_decimal::Decimal;
 use std::str::FromStr;
 
-use crate::models::{CarryforwardVintage, Declaration, DeclarationStatus, DeclarationType};
+use crate::models::{
+    CarryforwardVintage, Declaration, DeclarationStatus, DeclarationType, TAX_KEY_ORDER,
+};
 use crate::storage::Storage;
 
 /// The declaration's number at PURS, recorded when the taxpayer submits it.
@@ -410,19 +412,15 @@ impl<'a> DeclarationManager<'a> {
     /// assessed > `tax_due` > default(1.00).
     #[must_use]
     pub fn tax_due_rsd(&self, decl: &Declaration) -> Decimal {
-        if let Some(v) = decl.metadata.get("assessed_tax_due_rsd")
-            && let Some(s) = v.as_str()
-            && let Ok(d) = Decimal::from_str(s)
-        {
-            return d;
-        }
-        if let Some(v) = decl.metadata.get("tax_due_rsd")
-            && let Some(s) = v.as_str()
-            && let Ok(d) = Decimal::from_str(s)
-        {
-            return d;
-        }
-        Decimal::ONE
+        TAX_KEY_ORDER
+            .iter()
+            .find_map(|key| {
+                decl.metadata
+                    .get(*key)
+                    .and_then(|v| v.as_str())
+                    .and_then(|s| Decimal::from_str(s).ok())
+            })
+            .unwrap_or(Decimal::ONE)
     }
 
     #[must_use]
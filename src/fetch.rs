@@ -39,7 +39,7 @@ pub fn fetch_and_import(
         .with_context(|| storage.io_error_hint())?;
     info!(inserted, updated, "saved transactions");
 
-    prefetch_rates(storage, nbs, &transactions);
+    prefetch_rates(nbs, &transactions);
 
     Ok(FetchResult {
         transactions,
@@ -60,7 +60,7 @@ pub fn fetch_from_xml(xml: &str, storage: &Storage, nbs: &NBSClient) -> Result<F
         .with_context(|| storage.io_error_hint())?;
     info!(inserted, updated, "saved transactions from xml");
 
-    prefetch_rates(storage, nbs, &transactions);
+    prefetch_rates(nbs, &transactions);
 
     Ok(FetchResult {
         transactions,
@@ -79,21 +79,11 @@ pub fn validate_ibkr_config(config: &UserConfig) -> Result<()> {
     Ok(())
 }
 
-fn prefetch_rates(storage: &Storage, nbs: &NBSClient, transactions: &[Transaction]) {
-    use std::collections::HashSet;
+fn prefetch_rates(nbs: &NBSClient, transactions: &[Transaction]) {
+    let pairs = crate::nbs::rate_keys(transactions);
+    nbs.prefetch_rates(&pairs);
 
-    let mut seen = HashSet::new();
-    for txn in transactions {
-        let key = (txn.date, txn.currency.clone());
-        if seen.insert(key)
-            && let Err(e) = nbs.get_rate(txn.date, &txn.currency)
-        {
-            tracing::debug!(date = %txn.date, error = %e, "rate prefetch failed (non-fatal)");
-        }
-    }
-
-    let rates = storage.load_rates();
-    info!(cached_rates = rates.len(), "rate prefetch complete");
+    info!(pairs = pairs.len(), "rate prefetch complete");
 }
 
 #[cfg(test)]
@@ -254,7 +244,7 @@ mod tests {
             action_id: None,
         }];
 
-        prefetch_rates(&storage, &nbs, &txns);
+        prefetch_rates(&nbs, &txns);
         mock.assert();
 
         let cached = storage.get_exchange_rate(date, &Currency::USD);
@@ -296,7 +286,7 @@ mod tests {
         };
         let txns = vec![make_txn("D1"), make_txn("D2")];
 
-        prefetch_rates(&storage, &nbs, &txns);
+        prefetch_rates(&nbs, &txns);
         mock.assert();
     }
 }
@@ -257,8 +257,8 @@ impl App {
                 SortColumn::Id => a.declaration_id.cmp(&b.declaration_id),
                 SortColumn::Type => a.display_type().cmp(b.display_type()),
                 SortColumn::Period => a.period_start.cmp(&b.period_start),
-                SortColumn::Tax => a.display_tax().cmp(&b.display_tax()),
-                SortColumn::Status => a.status.to_string().cmp(&b.status.to_string()),
+                SortColumn::Tax => a.tax_metadata().cmp(&b.tax_metadata()),
+                SortColumn::Status => a.status.as_str().cmp(b.status.as_str()),
                 SortColumn::Created => a.created_at.cmp(&b.created_at),
             };
             if asc { ord } else { ord.reverse() }
@@ -56,42 +56,48 @@ pub fn show(ctx: &egui::Context, app: &mut App) {
 }
 
 pub fn format_declaration(decl: &crate::models::Declaration) -> String {
-    let mut lines = Vec::new();
-    lines.push(format!("ID:       {}", decl.declaration_id));
-    lines.push(format!("Type:     {}", decl.display_type()));
-    lines.push(format!("Period:   {}", decl.display_period()));
-    lines.push(format!("Status:   {}", decl.status));
-    lines.push(format!("Tax:      {}", decl.display_tax()));
-    lines.push(format!(
+    use std::fmt::Write;
+
+    // One buffer for the whole text; `writeln!` into a `String` cannot fail.
+    let mut out = String::new();
+    let _ = writeln!(out, "ID:       {}", decl.declaration_id);
+    let _ = writeln!(out, "Type:     {}", decl.display_type());
+    let _ = writeln!(out, "Period:   {}", decl.display_period());
+    let _ = writeln!(out, "Status:   {}", decl.status);
+    let _ = writeln!(out, "Tax:      {}", decl.display_tax());
+    let _ = writeln!(
+        out,
         "Created:  {}",
         decl.created_at.format("%Y-%m-%d %H:%M:%S")
-    ));
+    );
     if let Some(ref dt) = decl.submitted_at {
-        lines.push(format!("Submitted: {}", dt.format("%Y-%m-%d %H:%M:%S")));
+        let _ = writeln!(out, "Submitted: {}", dt.format("%Y-%m-%d %H:%M:%S"));
     }
     if let Some(ref dt) = decl.paid_at {
-        lines.push(format!("Paid:     {}", dt.format("%Y-%m-%d %H:%M:%S")));
+        let _ = writeln!(out, "Paid:     {}", dt.format("%Y-%m-%d %H:%M:%S"));
     }
 
     if !decl.metadata.is_empty() {
-        lines.push(String::new());
-        lines.push("--- Metadata ---".to_string());
+        out.push_str("\n--- Metadata ---\n");
         for (k, v) in &decl.metadata {
-            let val = match v {
-                serde_json::Value::String(s) => s.clone(),
-                other => other.to_string(),
-            };
-            lines.push(format!("{k}: {val}"));
+            match v {
+                serde_json::Value::String(s) => {
+                    let _ = writeln!(out, "{k}: {s}");
+                }
+                other => {
+                    let _ = writeln!(out, "{k}: {other}");
+                }
+            }
         }
     }
 
     if !decl.attached_files.is_empty() {
-        lines.push(String::new());
-        lines.push("--- Attached Files ---".to_string());
+        out.push_str("\n--- Attached Files ---\n");
         for (name, path) in &decl.attached_files {
-            lines.push(format!("{name}: {path}"));
+            let _ = writeln!(out, "{name}: {path}");
         }
     }
 
-    lines.join("\n")
+    out.pop();
+    out
 }
@@ -95,13 +95,14 @@ fn start_import(app: &mut App) {
     dialog.busy = true;
 
     let path = dialog.file_path.clone();
+    let config = app.config.clone();
     let (tx, rx) = mpsc::channel();
     app.bg_receiver = Some(rx);
     app.bg_busy = true;
     app.progress_text = Some("Importing\u{2026}".into());
 
     std::thread::spawn(move || {
-        let storage = crate::storage::Storage::new();
+        let storage = crate::storage::Storage::with_config(&config);
         let holidays = crate::holidays::HolidayCalendar::load_embedded();
         let nbs = crate::nbs::NBSClient::new(&storage, &holidays);
         let result =
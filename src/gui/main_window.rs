@@ -309,6 +309,7 @@ fn declaration_table(ui: &mut egui::Ui, app: &mut App) {
     let mut clicked_sort: Option<SortColumn> = None;
     let mut double_clicked_id: Option<String> = None;
     let mut action: Option<RowAction> = None;
+    let mut toggled: Option<(String, bool)> = None;
 
     table
         .header(row_height, |mut header| {
@@ -340,20 +341,19 @@ fn declaration_table(ui: &mut egui::Ui, app: &mut App) {
             });
         })
         .body(|body| {
-            let decls: Vec<_> = app.declarations.clone();
-            body.rows(row_height, decls.len(), |mut row| {
-                let idx = row.index();
-                let decl = &decls[idx];
+            // Rows borrow the list in place; cloning it here would deep-copy
+            // every declaration (XML and report data included) each frame.
+            // Checkbox changes are applied after the table, like the
+            // other row interactions.
+            let app = &*app;
+            body.rows(row_height, app.declarations.len(), |mut row| {
+                let decl = &app.declarations[row.index()];
                 let id = &decl.declaration_id;
 
                 row.col(|ui| {
                     let mut checked = app.selected.contains(id);
                     if ui.checkbox(&mut checked, "").changed() {
-                        if checked {
-                            app.selected.insert(id.clone());
-                        } else {
-                            app.selected.remove(id);
-                        }
+                        toggled = Some((id.clone(), checked));
                     }
                 });
 
@@ -370,7 +370,7 @@ fn declaration_table(ui: &mut egui::Ui, app: &mut App) {
                     ui.label(decl.display_tax());
                 });
                 row.col(|ui| {
-                    ui.label(decl.status.to_string());
+                    ui.label(decl.status.as_str());
                 });
                 row.col(|ui| {
                     ui.label(decl.created_at.format("%Y-%m-%d").to_string());
@@ -388,6 +388,13 @@ fn declaration_table(ui: &mut egui::Ui, app: &mut App) {
             });
         });
 
+    if let Some((id, checked)) = toggled {
+        if checked {
+            app.selected.insert(id);
+        } else {
+            app.selected.remove(&id);
+        }
+    }
     if let Some(col) = clicked_sort {
         app.set_sort(col);
     }
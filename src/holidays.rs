@@ -2,6 +2,7 @@ use chrono::{Datelike, NaiveDate, Weekday};
 use serde::{Deserialize, Serialize};
 use std::collections::{BTreeMap, HashMap, HashSet};
 use std::path::Path;
+use std::sync::LazyLock;
 use tracing::debug;
 
 use crate::holidays_fallback;
@@ -20,6 +21,11 @@ pub struct HolidaySnapshot {
 
 static EMBEDDED_JSON: &str = include_str!("generated/serbian_holidays.json");
 
+/// The embedded snapshot, parsed on first use and shared by every calendar
+/// built afterwards (the GUI builds one per background job).
+static EMBEDDED: LazyLock<HashMap<i32, HashSet<NaiveDate>>> =
+    LazyLock::new(|| parse_snapshot(EMBEDDED_JSON).expect("embedded holiday snapshot is invalid"));
+
 pub struct HolidayCalendar {
     embedded: HashMap<i32, HashSet<NaiveDate>>,
     file_overlay: HashMap<i32, HashSet<NaiveDate>>,
@@ -34,9 +40,8 @@ impl HolidayCalendar {
     /// Panics if the embedded holiday snapshot is invalid JSON.
     #[must_use]
     pub fn load_embedded() -> Self {
-        let embedded = parse_snapshot(EMBEDDED_JSON).expect("embedded holiday snapshot is invalid");
         Self {
-            embedded,
+            embedded: EMBEDDED.clone(),
             file_overlay: HashMap::new(),
             allow_fallback: false,
         }
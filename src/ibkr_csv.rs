@@ -1,4 +1,4 @@
-use anyhow::Result;
+use anyhow::{Context, Result};
 use chrono::NaiveDate;
 use rust_decimal::Decimal;
 use std::collections::HashMap;
@@ -6,7 +6,7 @@ use std::io::BufRead;
 use std::str::FromStr;
 use tracing::debug;
 
-use crate::models::{Currency, Transaction, TransactionType};
+use crate::models::{Currency, Transaction, TransactionType, parse_iso_date};
 
 /// Parse an IBKR Activity Statement CSV and return extracted transactions.
 ///
@@ -24,7 +24,13 @@ pub fn parse_csv_activity<R: BufRead>(reader: R) -> Result<Vec<Transaction>> {
     let mut divs_header: Option<HashMap<String, usize>> = None;
 
     for result in csv_reader.records() {
-        let Ok(record) = result else { continue };
+        let record = match result {
+            Ok(record) => record,
+            // Malformed rows are skipped, but a failing reader would fail
+            // on every retry -- stop instead of spinning on it.
+            Err(e) if e.is_io_error() => return Err(e).context("failed to read input"),
+            Err(_) => continue,
+        };
 
         if record.is_empty() {
             continue;
@@ -139,7 +145,7 @@ fn parse_dividend_row(
     let symbol = get_field(record, header, "Symbol").unwrap_or("UNKNOWN");
     let description = get_field(record, header, "Description").unwrap_or(section);
 
-    let date = NaiveDate::parse_from_str(dt_str, "%Y-%m-%d").ok()?;
+    let date = parse_iso_date(dt_str)?;
     let currency = Currency::from_code(curr_str)?;
     let amount = Decimal::from_str(&amount_str.replace(',', "")).ok()?;
 
@@ -180,5 +186,5 @@ fn parse_csv_date(s: &str) -> Option<NaiveDate> {
     } else {
         s
     };
-    NaiveDate::parse_from_str(date_part, "%Y-%m-%d").ok()
+    parse_iso_date(date_part)
 }
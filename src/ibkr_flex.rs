@@ -5,7 +5,7 @@ use serde::Deserialize;
 use std::str::FromStr;
 use tracing::debug;
 
-use crate::models::{Currency, Transaction, TransactionType};
+use crate::models::{Currency, Transaction, TransactionType, parse_iso_date};
 
 const FLEX_URL_REQUEST: &str =
     "https://ndcdyn.interactivebrokers.com/Universal/servlet/FlexStatementService.SendRequest";
@@ -143,7 +143,7 @@ impl IBKRClient {
                     last_err = Some(e);
                 }
                 Ok(body) => {
-                    if body.contains("<ErrorCode>")
+                    if looks_like_error_response(&body)
                         && let Ok(err_resp) = quick_xml::de::from_str::<XmlErrorResponse>(&body)
                         && let Some(code) = &err_resp.error_code
                     {
@@ -195,9 +195,22 @@ fn build_http_client(timeout: std::time::Duration) -> reqwest::blocking::Client
 // XML parsing (standalone — no HTTP needed)
 // ---------------------------------------------------------------------------
 
+/// How far into a response to look for an error marker. IBKR error replies
+/// are a few hundred bytes with `<ErrorCode>` right after `<Status>`.
+const ERROR_PROBE_BYTES: usize = 4096;
+
+/// Cheap pre-check before deserializing an error envelope: only the head of
+/// the document is scanned, so a multi-megabyte statement is not searched
+/// end to end for a marker that can only appear near the top.
+fn looks_like_error_response(xml: &str) -> bool {
+    const MARKER: &[u8] = b"<ErrorCode>";
+    let head = &xml.as_bytes()[..xml.len().min(ERROR_PROBE_BYTES)];
+    head.windows(MARKER.len()).any(|w| w == MARKER)
+}
+
 /// Parse an IBKR Flex Query XML report into a list of transactions.
 pub fn parse_flex_report(xml: &str) -> Result<Vec<Transaction>> {
-    if xml.contains("<ErrorCode>")
+    if looks_like_error_response(xml)
         && let Ok(err) = quick_xml::de::from_str::<XmlErrorResponse>(xml)
         && let Some(code) = &err.error_code
     {
@@ -236,7 +249,7 @@ pub fn parse_flex_report(xml: &str) -> Result<Vec<Transaction>> {
 fn parse_ibkr_date(s: &str) -> Option<NaiveDate> {
     let clean = s.split(';').next().unwrap_or(s);
     if clean.contains('-') {
-        NaiveDate::parse_from_str(clean, "%Y-%m-%d").ok()
+        parse_iso_date(clean)
     } else {
         NaiveDate::parse_from_str(clean, "%Y%m%d").ok()
     }
@@ -584,6 +597,21 @@ mod tests {
         assert_eq!(txns[0].action_id.as_deref(), Some("292616176"));
     }
 
+    #[test]
+    fn error_probe_only_reads_the_head() {
+        assert!(looks_like_error_response(
+            "<FlexStatementResponse><Status>Fail</Status><ErrorCode>1019</ErrorCode>"
+        ));
+        // A statement whose free text mentions the tag deep in the body is
+        // not an error envelope.
+        let deep = format!(
+            "<FlexQueryResponse>{}<ErrorCode>",
+            " ".repeat(ERROR_PROBE_BYTES)
+        );
+        assert!(!looks_like_error_response(&deep));
+        assert!(!looks_like_error_response(""));
+    }
+
     fn flex_xml_report() -> &'static str {
         r#"<FlexQueryResponse>
           <FlexStatements>
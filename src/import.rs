@@ -5,7 +5,6 @@ use anyhow::{Context, Result};
 use tracing::info;
 
 use crate::ibkr_csv;
-use crate::models::Transaction;
 use crate::nbs::NBSClient;
 use crate::storage::Storage;
 
@@ -20,14 +19,8 @@ pub fn import_from_reader<R: Read>(
     nbs: &NBSClient,
     reader: R,
 ) -> Result<ImportResult> {
-    let mut buf = Vec::new();
-    BufReader::new(reader)
-        .read_to_end(&mut buf)
-        .context("failed to read input")?;
-
-    let cursor = std::io::Cursor::new(buf);
     let transactions =
-        ibkr_csv::parse_csv_activity(BufReader::new(cursor)).context("failed to parse CSV")?;
+        ibkr_csv::parse_csv_activity(BufReader::new(reader)).context("failed to parse CSV")?;
 
     let transaction_count = transactions.len();
     let (inserted, updated) = storage.save_transactions(&transactions)?;
@@ -38,7 +31,7 @@ pub fn import_from_reader<R: Read>(
         "imported transactions"
     );
 
-    prefetch_rates(nbs, &transactions);
+    nbs.prefetch_rates(&crate::nbs::rate_keys(&transactions));
 
     Ok(ImportResult {
         inserted,
@@ -52,16 +45,3 @@ pub fn import_from_file(storage: &Storage, nbs: &NBSClient, path: &Path) -> Resu
         .with_context(|| format!("cannot open file: {}", path.display()))?;
     import_from_reader(storage, nbs, file)
 }
-
-fn prefetch_rates(nbs: &NBSClient, transactions: &[Transaction]) {
-    use std::collections::HashSet;
-    let mut seen = HashSet::new();
-    for txn in transactions {
-        let key = (txn.date, txn.currency.clone());
-        if seen.insert(key)
-            && let Err(e) = nbs.get_rate(txn.date, &txn.currency)
-        {
-            tracing::debug!(date = %txn.date, error = %e, "rate prefetch failed (non-fatal)");
-        }
-    }
-}
@@ -8,17 +8,15 @@ pub struct ListOptions {
 
 #[must_use]
 pub fn list_declarations(storage: &Storage, options: &ListOptions) -> Vec<Declaration> {
-    let status_filter = if options.show_all {
-        None
-    } else {
-        options.status.as_ref()
-    };
-
-    let mut decls = storage.get_declarations(status_filter, None);
-
-    if !options.show_all && options.status.is_none() {
-        decls.retain(|d| d.status != DeclarationStatus::Finalized);
-    }
+    let mut decls = storage.get_declarations_by_status(|s| {
+        if options.show_all {
+            true
+        } else if let Some(want) = options.status {
+            s == want
+        } else {
+            s != DeclarationStatus::Finalized
+        }
+    });
 
     decls.sort_by_key(|d| std::cmp::Reverse(d.created_at));
     decls
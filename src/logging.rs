@@ -1,6 +1,9 @@
+use std::io::{self, Write};
 use std::path::{Path, PathBuf};
+use std::sync::{Mutex, OnceLock, PoisonError};
 
-use tracing_appender::non_blocking::WorkerGuard;
+use tracing_appender::rolling::{RollingFileAppender, Rotation};
+use tracing_subscriber::fmt::MakeWriter;
 use tracing_subscriber::layer::SubscriberExt;
 use tracing_subscriber::util::SubscriberInitExt;
 use tracing_subscriber::{Layer, fmt};
@@ -10,24 +13,11 @@ pub fn log_dir() -> PathBuf {
     crate::config::config_dir().join("logs")
 }
 
-#[must_use]
-pub fn init(verbose: bool) -> Option<WorkerGuard> {
-    let dir = log_dir();
-    let _ = std::fs::create_dir_all(&dir);
-    cleanup_old_logs(&dir);
-
-    let appender = tracing_appender::rolling::RollingFileAppender::builder()
-        .rotation(tracing_appender::rolling::Rotation::DAILY)
-        .filename_prefix("error.log")
-        .build(&dir)
-        .ok()?;
-
-    let (non_blocking, guard) = tracing_appender::non_blocking(appender);
-
+pub fn init(verbose: bool) {
     let file_layer = fmt::layer()
         .with_ansi(false)
         .with_target(false)
-        .with_writer(non_blocking)
+        .with_writer(LazyLogFile::new(log_dir()))
         .with_filter(tracing_subscriber::filter::LevelFilter::WARN);
 
     if verbose {
@@ -41,8 +31,68 @@ pub fn init(verbose: bool) -> Option<WorkerGuard> {
     } else {
         tracing_subscriber::registry().with(file_layer).init();
     }
+}
+
+/// Error-log sink that creates the log dir, prunes old logs and opens
+/// today's file on the first WARN/ERROR event. A command that logs nothing
+/// (the common case, e.g. `list -1` in a pipeline) never touches the disk.
+struct LazyLogFile {
+    dir: PathBuf,
+    appender: OnceLock<Option<Mutex<RollingFileAppender>>>,
+}
+
+impl LazyLogFile {
+    fn new(dir: PathBuf) -> Self {
+        Self {
+            dir,
+            appender: OnceLock::new(),
+        }
+    }
 
-    Some(guard)
+    fn appender(&self) -> Option<&Mutex<RollingFileAppender>> {
+        self.appender
+            .get_or_init(|| {
+                let _ = std::fs::create_dir_all(&self.dir);
+                cleanup_old_logs(&self.dir);
+                RollingFileAppender::builder()
+                    .rotation(Rotation::DAILY)
+                    .filename_prefix("error.log")
+                    .build(&self.dir)
+                    .ok()
+                    .map(Mutex::new)
+            })
+            .as_ref()
+    }
+}
+
+impl<'a> MakeWriter<'a> for LazyLogFile {
+    type Writer = LazyLogWriter<'a>;
+
+    fn make_writer(&'a self) -> Self::Writer {
+        LazyLogWriter(self)
+    }
+}
+
+struct LazyLogWriter<'a>(&'a LazyLogFile);
+
+impl Write for LazyLogWriter<'_> {
+    fn write(&mut self, buf: &[u8]) -> io::Result<usize> {
+        match self.0.appender() {
+            Some(file) => file
+                .lock()
+                .unwrap_or_else(PoisonError::into_inner)
+                .write(buf),
+            // Logging must never fail the command it is reporting on.
+            None => Ok(buf.len()),
+        }
+    }
+
+    fn flush(&mut self) -> io::Result<()> {
+        match self.0.appender.get() {
+            Some(Some(file)) => file.lock().unwrap_or_else(PoisonError::into_inner).flush(),
+            _ => Ok(()),
+        }
+    }
 }
 
 fn cleanup_old_logs(dir: &Path) {
@@ -115,6 +165,18 @@ mod tests {
         );
     }
 
+    #[test]
+    fn lazy_log_file_touches_nothing_until_written() {
+        let tmp = tempfile::TempDir::new().unwrap();
+        let dir = tmp.path().join("logs");
+        let sink = LazyLogFile::new(dir.clone());
+        assert!(!dir.exists(), "no event yet, no log dir");
+
+        sink.make_writer().write_all(b"boom\n").unwrap();
+        assert!(dir.exists());
+        assert_eq!(std::fs::read_dir(&dir).unwrap().count(), 1);
+    }
+
     #[test]
     fn log_dir_returns_path_ending_in_logs() {
         let dir = log_dir();
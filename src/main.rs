@@ -180,7 +180,7 @@ enum Commands {
 
 fn main() {
     let cli = Cli::parse();
-    let _log_guard = ibkr_porez::logging::init(cli.verbose);
+    ibkr_porez::logging::init(cli.verbose);
 
     let result = match cli.command {
         Some(Commands::Config) => cli::config::run(),
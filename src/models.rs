@@ -21,6 +21,21 @@ pub enum TransactionType {
     Interest,
 }
 
+impl TransactionType {
+    /// The serialized name (`"TRADE"`, `"DIVIDEND"`, ...), without a serde
+    /// round trip.
+    #[must_use]
+    pub fn as_str(&self) -> &str {
+        match self {
+            Self::Trade => "TRADE",
+            Self::Dividend => "DIVIDEND",
+            Self::Tax => "TAX",
+            Self::WithholdingTax => "WITHHOLDING_TAX",
+            Self::Interest => "INTEREST",
+        }
+    }
+}
+
 #[derive(Serialize, Deserialize, Clone, Debug, PartialEq, Eq, Hash)]
 pub enum AssetClass {
     #[serde(rename = "STK")]
@@ -101,6 +116,16 @@ impl DeclarationStatus {
     pub fn draft_default() -> Self {
         Self::Draft
     }
+
+    #[must_use]
+    pub fn as_str(self) -> &'static str {
+        match self {
+            Self::Draft => "draft",
+            Self::Submitted => "submitted",
+            Self::Pending => "pending",
+            Self::Finalized => "finalized",
+        }
+    }
 }
 
 // ---------------------------------------------------------------------------
@@ -142,8 +167,30 @@ fn parse_decimal_value(value: &serde_json::Value) -> Result<Decimal, String> {
     }
 }
 
+/// Parse a `YYYY-MM-DD` date.
+///
+/// Every stored date uses this exact 10-byte layout, so it is read directly
+/// from the bytes; anything else falls back to chrono's `%Y-%m-%d` parser.
+#[must_use]
+pub fn parse_iso_date(s: &str) -> Option<NaiveDate> {
+    let b = s.as_bytes();
+    if b.len() == 10 && b[4] == b'-' && b[7] == b'-' {
+        let num = |digits: &[u8]| {
+            digits.iter().try_fold(0u32, |acc, &c| {
+                c.is_ascii_digit().then(|| acc * 10 + u32::from(c - b'0'))
+            })
+        };
+        if let (Some(y), Some(m), Some(d)) = (num(&b[..4]), num(&b[5..7]), num(&b[8..])) {
+            return i32::try_from(y)
+                .ok()
+                .and_then(|y| NaiveDate::from_ymd_opt(y, m, d));
+        }
+    }
+    NaiveDate::parse_from_str(s, "%Y-%m-%d").ok()
+}
+
 fn parse_date_str(s: &str) -> Result<NaiveDate, String> {
-    if let Ok(d) = NaiveDate::parse_from_str(s, "%Y-%m-%d") {
+    if let Some(d) = parse_iso_date(s) {
         return Ok(d);
     }
     if let Ok(dt) = NaiveDateTime::parse_from_str(s, "%Y-%m-%dT%H:%M:%S%.f") {
@@ -273,6 +320,10 @@ pub struct IncomeDeclarationEntry {
     pub porez_za_uplatu: Decimal,
 }
 
+/// Metadata keys holding a declaration's tax figure, highest precedence
+/// first: an assessed amount overrides the computed `tax_due_rsd`.
+pub const TAX_KEY_ORDER: [&str; 2] = ["assessed_tax_due_rsd", "tax_due_rsd"];
+
 #[derive(Serialize, Deserialize, Clone, Debug, PartialEq)]
 pub struct Declaration {
     pub declaration_id: String,
@@ -315,30 +366,34 @@ impl Declaration {
         }
     }
 
+    /// The tax figure to show, borrowed from metadata: the assessed amount
+    /// when one was recorded (flag `true`), otherwise `tax_due_rsd`.
+    ///
+    /// Cheap enough for sort comparators and per-row rendering, where
+    /// [`Self::display_tax`] would allocate a formatted string each call.
+    #[must_use]
+    pub fn tax_metadata(&self) -> Option<(&str, bool)> {
+        TAX_KEY_ORDER.iter().enumerate().find_map(|(i, key)| {
+            self.metadata
+                .get(*key)
+                .and_then(|v| v.as_str())
+                .map(|s| (s, i == 0))
+        })
+    }
+
     #[must_use]
     pub fn display_tax(&self) -> String {
-        if let Some(v) = self.metadata.get("assessed_tax_due_rsd")
-            && let Some(s) = v.as_str()
-        {
-            return format!("{s} RSD (assessed)");
+        match self.tax_metadata() {
+            Some((s, true)) => format!("{s} RSD (assessed)"),
+            Some((s, false)) => format!("{s} RSD"),
+            None => String::new(),
         }
-        if let Some(v) = self.metadata.get("tax_due_rsd")
-            && let Some(s) = v.as_str()
-        {
-            return format!("{s} RSD");
-        }
-        String::new()
     }
 }
 
 impl std::fmt::Display for DeclarationStatus {
     fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
-        match self {
-            Self::Draft => write!(f, "draft"),
-            Self::Submitted => write!(f, "submitted"),
-            Self::Pending => write!(f, "pending"),
-            Self::Finalized => write!(f, "finalized"),
-        }
+        f.write_str(self.as_str())
     }
 }
 
@@ -432,10 +487,7 @@ impl Transaction {
     #[must_use]
     pub fn make_key(&self) -> TransactionKey {
         let date_str = self.date.format("%Y-%m-%d").to_string();
-        let type_value = serde_json::to_value(&self.r#type)
-            .ok()
-            .and_then(|v| v.as_str().map(String::from))
-            .unwrap_or_default();
+        let type_value = self.r#type.as_str().to_string();
         let q = self
             .quantity
             .abs()
@@ -485,15 +537,7 @@ impl Transaction {
             return false;
         }
 
-        let self_type = serde_json::to_value(&self.r#type).unwrap_or_default();
-        let other_type = serde_json::to_value(&other.r#type).unwrap_or_default();
-        if self_type != other_type {
-            return false;
-        }
-
-        let self_cur = serde_json::to_value(&self.currency).unwrap_or_default();
-        let other_cur = serde_json::to_value(&other.currency).unwrap_or_default();
-        self_cur == other_cur
+        self.r#type == other.r#type && self.currency == other.currency
     }
 }
 
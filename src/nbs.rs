@@ -3,22 +3,28 @@ use chrono::NaiveDate;
 use rust_decimal::Decimal;
 use serde::Deserialize;
 use std::str::FromStr;
-use tracing::debug;
+use std::sync::OnceLock;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use tracing::{debug, warn};
 
 use crate::holidays::HolidayCalendar;
-use crate::models::{Currency, ExchangeRate};
+use crate::models::{Currency, ExchangeRate, Transaction};
 use crate::storage::Storage;
 
 const DEFAULT_BASE_URL: &str = "https://kurs.resenje.org/api/v1";
 const MAX_LOOKBACK_DAYS: u32 = 10;
 const MAX_RETRIES: u32 = 3;
 const RETRY_DELAY: std::time::Duration = std::time::Duration::from_secs(2);
+/// Upper bound on concurrent NBS lookups while prefetching.
+const PREFETCH_WORKERS: usize = 8;
 
 pub struct NBSClient<'a> {
     storage: &'a Storage,
     holidays: &'a HolidayCalendar,
     base_url: String,
-    http: reqwest::blocking::Client,
+    /// Built on first network fetch — runs served entirely from the rate
+    /// cache never pay for TLS backend setup.
+    http: OnceLock<reqwest::blocking::Client>,
     max_retries: u32,
     retry_delay: std::time::Duration,
 }
@@ -31,7 +37,7 @@ impl<'a> NBSClient<'a> {
             holidays,
             base_url: crate::config::base_url_override(crate::config::NBS_URL_ENV)
                 .unwrap_or_else(|| DEFAULT_BASE_URL.to_string()),
-            http: build_http_client(),
+            http: OnceLock::new(),
             max_retries: MAX_RETRIES,
             retry_delay: RETRY_DELAY,
         }
@@ -47,7 +53,7 @@ impl<'a> NBSClient<'a> {
             storage,
             holidays,
             base_url: base_url.to_string(),
-            http: build_http_client(),
+            http: OnceLock::new(),
             max_retries: MAX_RETRIES,
             retry_delay: RETRY_DELAY,
         }
@@ -130,6 +136,43 @@ impl<'a> NBSClient<'a> {
         Ok(None)
     }
 
+    /// Resolve rates for many `(date, currency)` pairs to warm the cache.
+    ///
+    /// Each lookup is an HTTPS round trip on a cache miss, so the pairs are
+    /// worked through by up to [`PREFETCH_WORKERS`] threads instead of one
+    /// after another. All of them share one rates batch: workers see each
+    /// other's results and `rates.json` is written once, at the end.
+    ///
+    /// Best-effort: a pair that fails is logged and skipped, and so is a
+    /// failure to write the cache at the end — report generation asks for
+    /// the rates again and surfaces any error there. Callers have already
+    /// saved their transactions, so a cache problem must not fail them.
+    pub fn prefetch_rates(&self, pairs: &[(NaiveDate, Currency)]) {
+        let written = self.storage.with_rates_batch(|| {
+            let next = AtomicUsize::new(0);
+            let work = || {
+                while let Some((date, currency)) = pairs.get(next.fetch_add(1, Ordering::Relaxed)) {
+                    if let Err(e) = self.get_rate(*date, currency) {
+                        debug!(%date, error = %e, "rate prefetch failed (non-fatal)");
+                    }
+                }
+            };
+            let workers = pairs.len().min(PREFETCH_WORKERS);
+            if workers <= 1 {
+                work();
+                return;
+            }
+            std::thread::scope(|s| {
+                for _ in 0..workers {
+                    s.spawn(work);
+                }
+            });
+        });
+        if let Err(e) = written {
+            warn!(error = %e, "could not save prefetched rates (non-fatal)");
+        }
+    }
+
     fn fetch_rate(&self, date: NaiveDate, currency: &Currency) -> Result<Option<Decimal>> {
         let url = format!(
             "{}/currencies/{}/rates/{}",
@@ -143,7 +186,7 @@ impl<'a> NBSClient<'a> {
             if attempt > 0 {
                 std::thread::sleep(self.retry_delay);
             }
-            match self.http.get(&url).send() {
+            match self.http().get(&url).send() {
                 Ok(resp) => {
                     let status = resp.status();
                     if status.is_client_error() {
@@ -167,6 +210,25 @@ impl<'a> NBSClient<'a> {
         }
         Err(last_err.unwrap_or_else(|| anyhow::anyhow!("fetch rate failed")))
     }
+
+    fn http(&self) -> &reqwest::blocking::Client {
+        self.http.get_or_init(build_http_client)
+    }
+}
+
+/// The distinct `(date, currency)` rates a set of transactions needs: each
+/// transaction's own date plus, for closed lots, its open date. First-seen
+/// order, ready for [`NBSClient::prefetch_rates`].
+#[must_use]
+pub fn rate_keys(transactions: &[Transaction]) -> Vec<(NaiveDate, Currency)> {
+    let mut keys = indexmap::IndexSet::new();
+    for txn in transactions {
+        keys.insert((txn.date, txn.currency.clone()));
+        if let Some(open_date) = txn.open_date {
+            keys.insert((open_date, txn.currency.clone()));
+        }
+    }
+    keys.into_iter().collect()
 }
 
 fn build_http_client() -> reqwest::blocking::Client {
@@ -11,7 +11,7 @@ use crate::models::{
 };
 use crate::nbs::NBSClient;
 use crate::storage::Storage;
-use crate::tax::TaxCalculator;
+use crate::tax::{TAX_RATE, TaxCalculator};
 
 pub struct GainsReport {
     pub filename: String,
@@ -24,18 +24,18 @@ pub struct GainsReport {
 }
 
 impl GainsReport {
+    /// Sum of gains and sum of (absolute) losses, in one pass over the entries.
     fn gross_and_losses(&self) -> (Decimal, Decimal) {
-        let gross = self
-            .entries
+        self.entries
             .iter()
-            .map(|e| e.capital_gain_rsd.max(Decimal::ZERO))
-            .sum();
-        let losses = self
-            .entries
-            .iter()
-            .map(|e| e.capital_gain_rsd.min(Decimal::ZERO).abs())
-            .sum();
-        (gross, losses)
+            .fold((Decimal::ZERO, Decimal::ZERO), |(gross, losses), e| {
+                let g = e.capital_gain_rsd;
+                if g.is_sign_negative() {
+                    (gross, losses - g)
+                } else {
+                    (gross + g, losses)
+                }
+            })
     }
 
     /// Calculated tax base for the period: gross gains minus losses, floored at zero.
@@ -48,11 +48,11 @@ impl GainsReport {
     /// Summary metadata for declaration storage.
     #[must_use]
     pub fn metadata(&self) -> indexmap::IndexMap<String, serde_json::Value> {
-        let total_gain: Decimal = self.entries.iter().map(|e| e.capital_gain_rsd).sum();
         let (gross, losses) = self.gross_and_losses();
+        let total_gain = gross - losses;
         let tax_base = (gross - losses).max(Decimal::ZERO);
-        let tax = (tax_base * Decimal::new(15, 2))
-            .round_dp_with_strategy(2, RoundingStrategy::MidpointAwayFromZero);
+        let tax =
+            (tax_base * TAX_RATE).round_dp_with_strategy(2, RoundingStrategy::MidpointAwayFromZero);
 
         let mut m = indexmap::IndexMap::new();
         m.insert("entry_count".into(), self.entries.len().into());
@@ -149,7 +149,7 @@ pub fn compute_carryforward_application(
     }
 
     let adjusted_tax_base = (calculated_tax_base - used).max(Decimal::ZERO);
-    let estimated_tax = (adjusted_tax_base * Decimal::new(15, 2))
+    let estimated_tax = (adjusted_tax_base * TAX_RATE)
         .round_dp_with_strategy(2, RoundingStrategy::MidpointAwayFromZero);
 
     CarryforwardApplication {
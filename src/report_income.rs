@@ -15,6 +15,7 @@ use crate::models::{
     TransactionType, UserConfig,
 };
 use crate::nbs::NBSClient;
+use crate::tax::TAX_RATE;
 
 /// A group that matched no withholding row at all is held this long before it
 /// is declared with a zero credit. The PP-OPO deadline is 30 days from the
@@ -156,21 +157,27 @@ impl IncomeReport {
             .to_uppercase();
         m.insert("symbol".into(), symbol.into());
 
-        let dates: Vec<NaiveDate> = self.entries.iter().map(|e| e.date).collect();
-        if let (Some(min), Some(max)) = (dates.iter().min(), dates.iter().max()) {
-            m.insert("period_start".into(), fmt_date(*min).into());
-            m.insert("period_end".into(), fmt_date(*max).into());
+        // Date range and every total in a single pass over the entries.
+        let mut period: Option<(NaiveDate, NaiveDate)> = None;
+        let mut gross = Decimal::ZERO;
+        let mut tax_base = Decimal::ZERO;
+        let mut calc_tax = Decimal::ZERO;
+        let mut foreign = Decimal::ZERO;
+        let mut due = Decimal::ZERO;
+        for e in &self.entries {
+            period = Some(period.map_or((e.date, e.date), |(lo, hi)| {
+                (lo.min(e.date), hi.max(e.date))
+            }));
+            gross += e.bruto_prihod;
+            tax_base += e.osnovica_za_porez;
+            calc_tax += e.obracunati_porez;
+            foreign += e.porez_placen_drugoj_drzavi;
+            due += e.porez_za_uplatu;
+        }
+        if let Some((min, max)) = period {
+            m.insert("period_start".into(), fmt_date(min).into());
+            m.insert("period_end".into(), fmt_date(max).into());
         }
-
-        let gross: Decimal = self.entries.iter().map(|e| e.bruto_prihod).sum();
-        let tax_base: Decimal = self.entries.iter().map(|e| e.osnovica_za_porez).sum();
-        let calc_tax: Decimal = self.entries.iter().map(|e| e.obracunati_porez).sum();
-        let foreign: Decimal = self
-            .entries
-            .iter()
-            .map(|e| e.porez_placen_drugoj_drzavi)
-            .sum();
-        let due: Decimal = self.entries.iter().map(|e| e.porez_za_uplatu).sum();
 
         m.insert("gross_income_rsd".into(), format!("{gross:.2}").into());
         m.insert("tax_base_rsd".into(), format!("{tax_base:.2}").into());
@@ -369,7 +376,7 @@ pub fn render_income_report(
 
     let total_bruto = round2(group.gross_ccy * rate);
     let porez_placen = round2(group.tax_ccy * rate);
-    let obracunati = round2_half_up(total_bruto * Decimal::new(15, 2));
+    let obracunati = round2_half_up(total_bruto * TAX_RATE);
 
     let decl_entry = IncomeDeclarationEntry {
         date: *date,
@@ -1,7 +1,9 @@
-use std::collections::BTreeMap;
+use std::cmp::Reverse;
+use std::collections::hash_map::Entry;
+use std::collections::{BTreeMap, HashMap};
 
 use anyhow::{Result, bail};
-use chrono::Datelike;
+use chrono::{Datelike, NaiveDate};
 use rust_decimal::Decimal;
 
 use crate::models::{Currency, TaxReportEntry, Transaction, TransactionType};
@@ -57,11 +59,24 @@ impl<'a> ShowStatistics<'a> {
         Self { storage, nbs }
     }
 
+    /// Every sale and dividend looks up exchange rates, often the same
+    /// `(date, currency)` many times over. The whole run shares one rates
+    /// batch so those lookups hit memory instead of re-reading `rates.json`.
     pub fn generate(
         &self,
         year: Option<i32>,
         ticker: Option<&str>,
         month: Option<&str>,
+    ) -> Result<StatResult> {
+        self.storage
+            .with_rates_batch(|| self.generate_inner(year, ticker, month))?
+    }
+
+    fn generate_inner(
+        &self,
+        year: Option<i32>,
+        ticker: Option<&str>,
+        month: Option<&str>,
     ) -> Result<StatResult> {
         let transactions = self.storage.load_transactions();
         if transactions.is_empty() {
@@ -247,80 +262,63 @@ fn aggregate_stats(
     target_year: Option<i32>,
     target_month: Option<u32>,
 ) -> Result<Vec<AggregatedRow>> {
-    // month -> ticker -> {divs, sales_count, pnl}
-    let mut stats: BTreeMap<String, BTreeMap<String, (Decimal, usize, Decimal)>> = BTreeMap::new();
+    let in_period = |d: NaiveDate| {
+        target_year.is_none_or(|y| d.year() == y) && target_month.is_none_or(|m| d.month() == m)
+    };
 
-    for entry in sales_entries {
-        if let Some(y) = target_year
-            && entry.sale_date.year() != y
-        {
-            continue;
-        }
-        if let Some(m) = target_month
-            && entry.sale_date.month() != m
-        {
-            continue;
-        }
-        let month_key = entry.sale_date.format("%Y-%m").to_string();
+    // (month, ticker) -> {divs, sales_count, pnl}. The month is kept as a
+    // reversed (year, month) so the map iterates newest month first, tickers
+    // A-Z — the table order — and is formatted only once per output row.
+    let month_of = |d: NaiveDate| Reverse((d.year(), d.month()));
+    let mut stats: BTreeMap<(Reverse<(i32, u32)>, String), (Decimal, usize, Decimal)> =
+        BTreeMap::new();
+
+    for entry in sales_entries.iter().filter(|e| in_period(e.sale_date)) {
         let bucket = stats
-            .entry(month_key)
-            .or_default()
-            .entry(entry.ticker.clone())
+            .entry((month_of(entry.sale_date), entry.ticker.clone()))
             .or_insert((Decimal::ZERO, 0, Decimal::ZERO));
         bucket.1 += 1;
         bucket.2 += entry.capital_gain_rsd;
     }
 
-    let dividends: Vec<&Transaction> = transactions
-        .iter()
-        .filter(|t| t.r#type == TransactionType::Dividend)
-        .collect();
-
-    for div in &dividends {
-        if let Some(y) = target_year
-            && div.date.year() != y
-        {
-            continue;
-        }
-        if let Some(m) = target_month
-            && div.date.month() != m
-        {
-            continue;
-        }
+    // Dividends cluster on a few pay dates, so each (date, currency) rate is
+    // resolved once rather than once per dividend row.
+    let mut rates: HashMap<(NaiveDate, &Currency), Option<Decimal>> = HashMap::new();
 
+    for div in transactions
+        .iter()
+        .filter(|t| t.r#type == TransactionType::Dividend && in_period(t.date))
+    {
         let amount_rsd = if div.currency == Currency::RSD {
             div.amount
         } else if let Some(rsd) = div.amount_rsd {
             rsd
         } else {
-            let rate = nbs.get_rate(div.date, &div.currency)?;
+            let rate = match rates.entry((div.date, &div.currency)) {
+                Entry::Occupied(e) => *e.get(),
+                Entry::Vacant(e) => *e.insert(nbs.get_rate(div.date, &div.currency)?),
+            };
             rate.map_or(div.amount, |r| div.amount * r)
         };
 
-        let month_key = div.date.format("%Y-%m").to_string();
         let bucket = stats
-            .entry(month_key)
-            .or_default()
-            .entry(div.symbol.clone())
+            .entry((month_of(div.date), div.symbol.clone()))
             .or_insert((Decimal::ZERO, 0, Decimal::ZERO));
         bucket.0 += amount_rsd;
     }
 
-    let mut rows: Vec<AggregatedRow> = Vec::new();
-    for (month, tickers) in &stats {
-        for (ticker, (divs, count, pnl)) in tickers {
-            rows.push(AggregatedRow {
-                month: month.clone(),
-                ticker: ticker.clone(),
-                dividends_rsd: *divs,
-                sales_count: *count,
-                realized_pnl_rsd: *pnl,
-            });
-        }
-    }
-
-    rows.sort_by(|a, b| a.ticker.cmp(&b.ticker));
-    rows.sort_by(|a, b| b.month.cmp(&a.month));
+    let rows = stats
+        .into_iter()
+        .map(
+            |((Reverse((year, month)), ticker), (divs, count, pnl))| AggregatedRow {
+                month: format!("{year:04}-{month:02}"),
+                ticker,
+                dividends_rsd: divs,
+                sales_count: count,
+                realized_pnl_rsd: pnl,
+            },
+        )
+        .collect();
 
     Ok(rows)
 }
@@ -476,6 +474,35 @@ mod tests {
         assert!(title.contains("2025"));
     }
 
+    #[test]
+    fn aggregate_stats_orders_newest_month_first_then_ticker() {
+        let dir = tempfile::TempDir::new().unwrap();
+        let storage = Storage::with_dir(dir.path());
+        let cal = crate::holidays::HolidayCalendar::load_embedded();
+        let nbs = NBSClient::new(&storage, &cal);
+        let entries = vec![
+            make_entry("MSFT", NaiveDate::from_ymd_opt(2025, 3, 1).unwrap()),
+            make_entry("AAPL", NaiveDate::from_ymd_opt(2025, 3, 2).unwrap()),
+            make_entry("MSFT", NaiveDate::from_ymd_opt(2025, 4, 1).unwrap()),
+            make_entry("AAPL", NaiveDate::from_ymd_opt(2025, 1, 1).unwrap()),
+        ];
+
+        let rows = aggregate_stats(&entries, &[], &nbs, None, None).unwrap();
+        let order: Vec<(&str, &str)> = rows
+            .iter()
+            .map(|r| (r.month.as_str(), r.ticker.as_str()))
+            .collect();
+        assert_eq!(
+            order,
+            [
+                ("2025-04", "MSFT"),
+                ("2025-03", "AAPL"),
+                ("2025-03", "MSFT"),
+                ("2025-01", "AAPL"),
+            ]
+        );
+    }
+
     #[test]
     fn find_latest_year_for_month_from_sales() {
         let entries = vec![
@@ -1,16 +1,18 @@
 use std::collections::{HashMap, HashSet};
 use std::path::{Path, PathBuf};
+use std::sync::{Mutex, MutexGuard, PoisonError};
 
 use anyhow::Result;
 use chrono::{NaiveDate, NaiveDateTime};
 use indexmap::IndexMap;
 use rust_decimal::Decimal;
+use serde::Deserialize;
 
 use crate::config;
 use crate::models::{
     CarryforwardLedger, CarryforwardSource, CarryforwardVintage, Currency, Declaration,
     DeclarationStatus, DeclarationType, DeclarationsFile, ExchangeRate, SyncIssue, Transaction,
-    TransactionKey, UserConfig,
+    TransactionKey, UserConfig, parse_iso_date,
 };
 
 const RATES_FILENAME: &str = "rates.json";
@@ -19,8 +21,6 @@ const CAPITAL_LOSSES_FILENAME: &str = "capital_losses.json";
 const TRANSACTIONS_FILENAME: &str = "transactions.json";
 const DECLARATIONS_DIR: &str = "declarations";
 const FLEX_QUERIES_DIR: &str = "flex-queries";
-const APP_NAME: &str = "ibkr-porez";
-const DATA_SUBDIR: &str = "ibkr-porez-data";
 
 pub struct Storage {
     data_dir: PathBuf,
@@ -30,6 +30,65 @@ pub struct Storage {
     capital_losses_file: PathBuf,
     declarations_dir: PathBuf,
     flex_queries_dir: PathBuf,
+    /// Open [`Storage::with_rates_batch`] scope, if any.
+    rates_batch: Mutex<Option<WriteBatch<IndexMap<String, String>>>>,
+    /// Open [`Storage::with_declarations_batch`] scope, if any.
+    declarations_batch: Mutex<Option<WriteBatch<DeclarationsFile>>>,
+}
+
+/// In-memory copy of a JSON file while a batch scope is open; written back
+/// once on exit if anything changed.
+struct WriteBatch<T> {
+    data: T,
+    dirty: bool,
+}
+
+impl<T> WriteBatch<T> {
+    fn new(data: T) -> Self {
+        Self { data, dirty: false }
+    }
+}
+
+fn lock_batch<T>(batch: &Mutex<Option<WriteBatch<T>>>) -> MutexGuard<'_, Option<WriteBatch<T>>> {
+    batch.lock().unwrap_or_else(PoisonError::into_inner)
+}
+
+/// Opens a batch on `slot` (unless one is already open), runs `f`, and
+/// flushes through `write` if this call opened the batch and data changed.
+fn run_batch<T, R>(
+    slot: &Mutex<Option<WriteBatch<T>>>,
+    load: impl FnOnce() -> T,
+    write: impl FnOnce(&T) -> Result<()>,
+    f: impl FnOnce() -> R,
+) -> Result<R> {
+    {
+        let mut batch = lock_batch(slot);
+        if batch.is_some() {
+            drop(batch);
+            return Ok(f());
+        }
+        *batch = Some(WriteBatch::new(load()));
+    }
+    let _scope = BatchScope { slot };
+    let out = f();
+    if let Some(batch) = lock_batch(slot).take()
+        && batch.dirty
+    {
+        write(&batch.data)?;
+    }
+    Ok(out)
+}
+
+/// Closes the batch opened by [`run_batch`] when dropped, so a panic in the
+/// scope cannot leave stale data behind for later calls to read.
+struct BatchScope<'a, T> {
+    slot: &'a Mutex<Option<WriteBatch<T>>>,
+}
+
+impl<T> Drop for BatchScope<'_, T> {
+    fn drop(&mut self) {
+        lock_batch(self.slot).take();
+    }
 }
 
 impl Default for Storage {
@@ -47,12 +106,9 @@ impl Storage {
 
     #[must_use]
     pub fn with_config(cfg: &UserConfig) -> Self {
-        let app_data_dir = dirs::data_dir()
-            .unwrap_or_else(|| PathBuf::from("."))
-            .join(APP_NAME);
         let data_dir = match &cfg.data_dir {
             Some(d) if !d.is_empty() => PathBuf::from(d),
-            _ => app_data_dir.join(DATA_SUBDIR),
+            _ => config::get_default_data_dir_path(),
         };
 
         let s = Self {
@@ -63,6 +119,8 @@ impl Storage {
             declarations_dir: data_dir.join(DECLARATIONS_DIR),
             flex_queries_dir: data_dir.join(FLEX_QUERIES_DIR),
             data_dir,
+            rates_batch: Mutex::new(None),
+            declarations_batch: Mutex::new(None),
         };
         s.ensure_dirs();
         s
@@ -79,13 +137,16 @@ impl Storage {
             capital_losses_file: dir.join(CAPITAL_LOSSES_FILENAME),
             declarations_dir: dir.join(DECLARATIONS_DIR),
             flex_queries_dir: dir.join(FLEX_QUERIES_DIR),
+            rates_batch: Mutex::new(None),
+            declarations_batch: Mutex::new(None),
         };
         s.ensure_dirs();
         s
     }
 
     fn ensure_dirs(&self) {
-        let _ = std::fs::create_dir_all(&self.data_dir);
+        // Both subdirectories live under `data_dir`, so creating them
+        // creates it too.
         let _ = std::fs::create_dir_all(&self.declarations_dir);
         let _ = std::fs::create_dir_all(&self.flex_queries_dir);
     }
@@ -123,11 +184,11 @@ impl Storage {
     // =======================================================================
 
     /// Read transactions from disk. Returns empty vec on missing / invalid file.
+    ///
+    /// Loaders go straight to the read: a missing file surfaces as its
+    /// error, so a separate `exists()` would only add a `stat` per load.
     #[must_use]
     pub fn load_transactions(&self) -> Vec<Transaction> {
-        if !self.transactions_file.exists() {
-            return Vec::new();
-        }
         match std::fs::read_to_string(&self.transactions_file) {
             Ok(content) => serde_json::from_str(&content).unwrap_or_default(),
             Err(_) => Vec::new(),
@@ -189,43 +250,73 @@ impl Storage {
 
     #[must_use]
     pub fn load_rates(&self) -> IndexMap<String, String> {
-        if !self.rates_file.exists() {
-            return IndexMap::new();
-        }
+        self.with_rates(IndexMap::clone)
+    }
+
+    fn read_rates_file(&self) -> IndexMap<String, String> {
         match std::fs::read_to_string(&self.rates_file) {
             Ok(content) => serde_json::from_str(&content).unwrap_or_default(),
             Err(_) => IndexMap::new(),
         }
     }
 
+    /// Run lookups against the open batch, or a fresh read of `rates.json`.
+    fn with_rates<T>(&self, f: impl FnOnce(&IndexMap<String, String>) -> T) -> T {
+        if let Some(batch) = lock_batch(&self.rates_batch).as_ref() {
+            return f(&batch.data);
+        }
+        f(&self.read_rates_file())
+    }
+
+    /// Run `f` with exchange-rate reads and writes served from memory.
+    ///
+    /// `rates.json` is loaded once up front and written at most once when
+    /// `f` returns, instead of a full read-modify-write per saved rate.
+    /// Nested calls join the outermost batch.
+    pub fn with_rates_batch<T>(&self, f: impl FnOnce() -> T) -> Result<T> {
+        run_batch(
+            &self.rates_batch,
+            || self.read_rates_file(),
+            |rates| self.write_rates_file(rates),
+            f,
+        )
+    }
+
     pub fn save_exchange_rate(&self, rate: &ExchangeRate) -> Result<()> {
-        let mut rates = self.load_rates();
         let key = format!(
             "{}_{}",
             rate.date.format("%Y-%m-%d"),
-            serde_json::to_value(&rate.currency)?
-                .as_str()
-                .unwrap_or("USD")
+            rate.currency.as_code()
         );
+        if let Some(batch) = lock_batch(&self.rates_batch).as_mut() {
+            batch.data.insert(key, rate.rate.to_string());
+            batch.dirty = true;
+            return Ok(());
+        }
+        let mut rates = self.read_rates_file();
         rates.insert(key, rate.rate.to_string());
-        self.write_rates(&rates)
+        self.write_rates_file(&rates)
     }
 
     pub fn write_rates(&self, rates: &IndexMap<String, String>) -> Result<()> {
+        self.write_rates_file(rates)?;
+        if let Some(batch) = lock_batch(&self.rates_batch).as_mut() {
+            batch.data.clone_from(rates);
+            batch.dirty = false;
+        }
+        Ok(())
+    }
+
+    fn write_rates_file(&self, rates: &IndexMap<String, String>) -> Result<()> {
         let json = serde_json::to_string_pretty(rates)?;
         std::fs::write(&self.rates_file, &json)?;
         Ok(())
     }
 
     pub fn get_exchange_rate(&self, date: NaiveDate, currency: &Currency) -> Option<ExchangeRate> {
-        let rates = self.load_rates();
-        let cur_str = serde_json::to_value(currency)
-            .ok()?
-            .as_str()
-            .map(String::from)?;
+        let cur_str = currency.as_code();
         let key = format!("{}_{cur_str}", date.format("%Y-%m-%d"));
-        let val = rates.get(&key)?;
-        let rate = val.parse::<Decimal>().ok()?;
+        let rate = self.with_rates(|rates| rates.get(&key)?.parse::<Decimal>().ok())?;
         Some(ExchangeRate {
             date,
             currency: currency.clone(),
@@ -243,96 +334,110 @@ impl Storage {
         currency: &Currency,
         max_lookback: u32,
     ) -> Option<ExchangeRate> {
-        let rates = self.load_rates();
-        let cur_str = serde_json::to_value(currency)
-            .ok()?
-            .as_str()
-            .map(String::from)?;
-
-        let mut target = date;
-        for _ in 0..max_lookback {
-            let key = format!("{}_{cur_str}", target.format("%Y-%m-%d"));
-            if let Some(val) = rates.get(&key)
-                && let Ok(rate) = val.parse::<Decimal>()
-            {
-                return Some(ExchangeRate {
-                    date: target,
-                    currency: currency.clone(),
-                    rate,
-                });
+        let cur_str = currency.as_code();
+
+        self.with_rates(|rates| {
+            let mut target = date;
+            for _ in 0..max_lookback {
+                let key = format!("{}_{cur_str}", target.format("%Y-%m-%d"));
+                if let Some(val) = rates.get(&key)
+                    && let Ok(rate) = val.parse::<Decimal>()
+                {
+                    return Some(ExchangeRate {
+                        date: target,
+                        currency: currency.clone(),
+                        rate,
+                    });
+                }
+                target -= chrono::Duration::days(1);
             }
-            target -= chrono::Duration::days(1);
-        }
-        None
+            None
+        })
     }
 
     // =======================================================================
     // Declarations
     // =======================================================================
 
-    fn load_declarations_file(&self) -> DeclarationsFile {
-        if !self.declarations_file.exists() {
-            return DeclarationsFile::default();
+    /// Run lookups against the open batch, or a fresh read of
+    /// `declarations.json`. A batch is borrowed rather than cloned, so
+    /// read-only queries inside a batch cost no copy of the index.
+    fn with_declarations<T>(&self, f: impl FnOnce(&DeclarationsFile) -> T) -> T {
+        if let Some(batch) = lock_batch(&self.declarations_batch).as_ref() {
+            return f(&batch.data);
+        }
+        f(&self.read_declarations_file())
+    }
+
+    /// Apply `f` to the open batch in place, or to a fresh read that is
+    /// written back. `f` must leave the data untouched when it fails: the
+    /// batch is only marked dirty, and the file only written, on success.
+    fn with_declarations_mut<T>(
+        &self,
+        f: impl FnOnce(&mut DeclarationsFile) -> Result<T>,
+    ) -> Result<T> {
+        if let Some(batch) = lock_batch(&self.declarations_batch).as_mut() {
+            let out = f(&mut batch.data)?;
+            batch.dirty = true;
+            return Ok(out);
         }
+        let mut data = self.read_declarations_file();
+        let out = f(&mut data)?;
+        self.write_declarations_file(&data)?;
+        Ok(out)
+    }
+
+    fn read_declarations_file(&self) -> DeclarationsFile {
         match std::fs::read_to_string(&self.declarations_file) {
             Ok(content) => serde_json::from_str(&content).unwrap_or_default(),
             Err(_) => DeclarationsFile::default(),
         }
     }
 
-    fn save_declarations_file(&self, data: &DeclarationsFile) -> Result<()> {
+    fn write_declarations_file(&self, data: &DeclarationsFile) -> Result<()> {
         let json = serde_json::to_string_pretty(data)?;
         std::fs::write(&self.declarations_file, &json)?;
         Ok(())
     }
 
-    pub fn save_declaration(&self, declaration: &Declaration) -> Result<()> {
-        let mut file = self.load_declarations_file();
-
-        let mut declarations: Vec<Declaration> = file
-            .declarations
-            .iter()
-            .filter_map(|v| serde_json::from_value(v.clone()).ok())
-            .collect();
-
-        if let Some(idx) = declarations
-            .iter()
-            .position(|d| d.declaration_id == declaration.declaration_id)
-        {
-            declarations[idx] = declaration.clone();
-        } else {
-            declarations.push(declaration.clone());
-        }
-
-        file.declarations = declarations
-            .iter()
-            .filter_map(|d| serde_json::to_value(d).ok())
-            .collect();
+    /// Run `f` with `declarations.json` held in memory, writing it at most
+    /// once when `f` returns. Used by bulk commands so N IDs cost one read
+    /// and one write instead of N of each. Nested calls join the outermost
+    /// batch.
+    pub fn with_declarations_batch<T>(&self, f: impl FnOnce() -> T) -> Result<T> {
+        run_batch(
+            &self.declarations_batch,
+            || self.read_declarations_file(),
+            |data| self.write_declarations_file(data),
+            f,
+        )
+    }
 
-        self.save_declarations_file(&file)
+    pub fn save_declaration(&self, declaration: &Declaration) -> Result<()> {
+        let value = serde_json::to_value(declaration)?;
+        self.with_declarations_mut(|file| {
+            match file
+                .declarations
+                .iter_mut()
+                .find(|v| raw_declaration_id(v) == Some(declaration.declaration_id.as_str()))
+            {
+                Some(existing) => *existing = value,
+                None => file.declarations.push(value),
+            }
+            Ok(())
+        })
     }
 
     pub fn delete_declaration(&self, declaration_id: &str) -> Result<()> {
-        let mut file = self.load_declarations_file();
-
-        let mut declarations: Vec<Declaration> = file
-            .declarations
-            .iter()
-            .filter_map(|v| serde_json::from_value(v.clone()).ok())
-            .collect();
-
-        let before = declarations.len();
-        declarations.retain(|d| d.declaration_id != declaration_id);
-        if declarations.len() == before {
-            anyhow::bail!("declaration {declaration_id} not found");
-        }
-
-        file.declarations = declarations
-            .iter()
-            .filter_map(|d| serde_json::to_value(d).ok())
-            .collect();
-
-        self.save_declarations_file(&file)
+        self.with_declarations_mut(|file| {
+            let before = file.declarations.len();
+            file.declarations
+                .retain(|v| raw_declaration_id(v) != Some(declaration_id));
+            if file.declarations.len() == before {
+                anyhow::bail!("declaration {declaration_id} not found");
+            }
+            Ok(())
+        })
     }
 
     #[must_use]
@@ -341,22 +446,48 @@ impl Storage {
         status: Option<&DeclarationStatus>,
         declaration_type: Option<&DeclarationType>,
     ) -> Vec<Declaration> {
-        let file = self.load_declarations_file();
-        let mut decls: Vec<Declaration> = file
-            .declarations
-            .iter()
-            .filter_map(|v| serde_json::from_value(v.clone()).ok())
-            .collect();
-
-        if let Some(s) = status {
-            decls.retain(|d| &d.status == s);
-        }
+        let mut decls = self.get_declarations_by_status(|s| status.is_none_or(|want| s == *want));
         if let Some(t) = declaration_type {
             decls.retain(|d| &d.r#type == t);
         }
         decls
     }
 
+    /// Declarations whose status satisfies `keep`.
+    ///
+    /// The status is read from the raw JSON record first, so records that
+    /// are filtered out are never fully deserialized.
+    #[must_use]
+    pub fn get_declarations_by_status(
+        &self,
+        keep: impl Fn(DeclarationStatus) -> bool,
+    ) -> Vec<Declaration> {
+        self.with_declarations(|file| {
+            file.declarations
+                .iter()
+                .filter(|v| raw_declaration_status(v).is_some_and(&keep))
+                .filter_map(|v| Declaration::deserialize(v).ok())
+                .collect()
+        })
+    }
+
+    /// One past the highest numeric declaration id.
+    ///
+    /// max+1, not len+1: after a declaration is deleted from the middle of
+    /// the list (delete PP-OPO case) len+1 could collide with a surviving id
+    /// and silently overwrite it in [`Storage::save_declaration`]. Only the
+    /// `declaration_id` field of each record is read.
+    #[must_use]
+    pub fn next_declaration_id(&self) -> usize {
+        self.with_declarations(|file| {
+            file.declarations
+                .iter()
+                .filter_map(|v| raw_declaration_id(v)?.parse::<usize>().ok())
+                .max()
+                .unwrap_or(0)
+        }) + 1
+    }
+
     #[must_use]
     pub fn get_declaration(&self, declaration_id: &str) -> Option<Declaration> {
         self.get_declarations(None, None)
@@ -375,85 +506,98 @@ impl Storage {
         status: DeclarationStatus,
         timestamp: chrono::NaiveDateTime,
     ) -> Result<()> {
-        let mut decl = self
-            .get_declaration(declaration_id)
-            .ok_or_else(|| anyhow::anyhow!("Declaration {declaration_id} not found"))?;
-
-        decl.status = status;
-        if status == DeclarationStatus::Submitted {
-            decl.submitted_at = Some(timestamp);
-        }
-        self.save_declaration(&decl)
+        self.with_declarations_mut(|file| {
+            let value = file
+                .declarations
+                .iter_mut()
+                .find(|v| raw_declaration_id(v) == Some(declaration_id))
+                .ok_or_else(|| anyhow::anyhow!("Declaration {declaration_id} not found"))?;
+            let mut decl = Declaration::deserialize(&*value)?;
+            decl.status = status;
+            if status == DeclarationStatus::Submitted {
+                decl.submitted_at = Some(timestamp);
+            }
+            *value = serde_json::to_value(&decl)?;
+            Ok(())
+        })
     }
 
     #[must_use]
     pub fn get_last_declaration_date(&self) -> Option<NaiveDate> {
-        let file = self.load_declarations_file();
-        file.last_declaration_date
-            .as_deref()
-            .and_then(|s| NaiveDate::parse_from_str(s, "%Y-%m-%d").ok())
+        self.with_declarations(|file| {
+            file.last_declaration_date
+                .as_deref()
+                .and_then(parse_iso_date)
+        })
     }
 
     pub fn set_last_declaration_date(&self, date: NaiveDate) -> Result<()> {
-        let mut file = self.load_declarations_file();
-        file.last_declaration_date = Some(date.format("%Y-%m-%d").to_string());
-        self.save_declarations_file(&file)
+        self.with_declarations_mut(|file| {
+            file.last_declaration_date = Some(date.format("%Y-%m-%d").to_string());
+            Ok(())
+        })
     }
 
     #[must_use]
     pub fn get_last_sync_success(&self) -> Option<NaiveDateTime> {
-        let file = self.load_declarations_file();
-        file.last_sync_success
-            .as_deref()
-            .and_then(|s| NaiveDateTime::parse_from_str(s, "%Y-%m-%dT%H:%M:%S").ok())
+        self.with_declarations(|file| {
+            file.last_sync_success
+                .as_deref()
+                .and_then(|s| NaiveDateTime::parse_from_str(s, "%Y-%m-%dT%H:%M:%S").ok())
+        })
     }
 
     pub fn set_last_sync_success(&self, at: NaiveDateTime) -> Result<()> {
-        let mut file = self.load_declarations_file();
-        file.last_sync_success = Some(at.format("%Y-%m-%dT%H:%M:%S").to_string());
-        self.save_declarations_file(&file)
+        self.with_declarations_mut(|file| {
+            file.last_sync_success = Some(at.format("%Y-%m-%dT%H:%M:%S").to_string());
+            Ok(())
+        })
     }
 
     #[must_use]
     pub fn get_last_sync_issue(&self) -> Option<(NaiveDateTime, String)> {
-        let file = self.load_declarations_file();
-        file.last_sync_issue.and_then(|issue| {
+        self.with_declarations(|file| {
+            let issue = file.last_sync_issue.as_ref()?;
             NaiveDateTime::parse_from_str(&issue.at, "%Y-%m-%dT%H:%M:%S")
                 .ok()
-                .map(|at| (at, issue.message))
+                .map(|at| (at, issue.message.clone()))
         })
     }
 
     pub fn set_last_sync_issue(&self, at: NaiveDateTime, message: &str) -> Result<()> {
-        let mut file = self.load_declarations_file();
-        file.last_sync_issue = Some(SyncIssue {
-            at: at.format("%Y-%m-%dT%H:%M:%S").to_string(),
-            message: message.to_string(),
-        });
-        self.save_declarations_file(&file)
+        self.with_declarations_mut(|file| {
+            file.last_sync_issue = Some(SyncIssue {
+                at: at.format("%Y-%m-%dT%H:%M:%S").to_string(),
+                message: message.to_string(),
+            });
+            Ok(())
+        })
     }
 
     pub fn clear_last_sync_issue(&self) -> Result<()> {
-        let mut file = self.load_declarations_file();
-        file.last_sync_issue = None;
-        self.save_declarations_file(&file)
+        self.with_declarations_mut(|file| {
+            file.last_sync_issue = None;
+            Ok(())
+        })
     }
 
     #[must_use]
     pub fn get_pending_new_declarations(&self) -> u32 {
-        self.load_declarations_file().pending_new_declarations
+        self.with_declarations(|file| file.pending_new_declarations)
     }
 
     pub fn add_pending_new_declarations(&self, count: u32) -> Result<()> {
-        let mut file = self.load_declarations_file();
-        file.pending_new_declarations += count;
-        self.save_declarations_file(&file)
+        self.with_declarations_mut(|file| {
+            file.pending_new_declarations += count;
+            Ok(())
+        })
     }
 
     pub fn clear_pending_new_declarations(&self) -> Result<()> {
-        let mut file = self.load_declarations_file();
-        file.pending_new_declarations = 0;
-        self.save_declarations_file(&file)
+        self.with_declarations_mut(|file| {
+            file.pending_new_declarations = 0;
+            Ok(())
+        })
     }
 
     // =======================================================================
@@ -461,9 +605,6 @@ impl Storage {
     // =======================================================================
 
     fn load_carryforward_ledger(&self) -> CarryforwardLedger {
-        if !self.capital_losses_file.exists() {
-            return CarryforwardLedger::default();
-        }
         match std::fs::read_to_string(&self.capital_losses_file) {
             Ok(content) => serde_json::from_str(&content).unwrap_or_default(),
             Err(_) => CarryforwardLedger::default(),
@@ -538,6 +679,35 @@ impl Storage {
     pub fn restore_report(&self, report_date: NaiveDate) -> Option<String> {
         crate::storage_flex::restore_report(&self.flex_queries_dir, report_date)
     }
+
+    #[must_use]
+    pub fn has_report(&self, report_date: NaiveDate) -> bool {
+        crate::storage_flex::has_report(&self.flex_queries_dir, report_date)
+    }
+
+    /// Stream a flex query XML report into `sink`; `Ok(false)` if there is none.
+    pub fn restore_report_to<W: std::io::Write>(
+        &self,
+        report_date: NaiveDate,
+        sink: W,
+    ) -> Result<bool> {
+        crate::storage_flex::restore_report_to(&self.flex_queries_dir, report_date, sink)
+    }
+}
+
+/// `declaration_id` of a stored declaration record, read without
+/// deserializing the rest of it.
+fn raw_declaration_id(record: &serde_json::Value) -> Option<&str> {
+    record.get("declaration_id")?.as_str()
+}
+
+/// Status of a stored declaration record, with the same default as
+/// `Declaration` itself. `None` for an unrecognised status value.
+fn raw_declaration_status(record: &serde_json::Value) -> Option<DeclarationStatus> {
+    match record.get("status") {
+        None => Some(DeclarationStatus::draft_default()),
+        Some(v) => DeclarationStatus::deserialize(v).ok(),
+    }
 }
 
 // ===========================================================================
@@ -10,6 +10,8 @@ static HUNK_RE: LazyLock<Regex> =
     LazyLock::new(|| Regex::new(r"@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@").unwrap());
 
 const SMALL_FILE_THRESHOLD_BYTES: usize = 2048;
+/// Upper bound on the up-front buffer taken from a zip entry's declared size.
+const MAX_PREALLOC_BYTES: u64 = 64 << 20;
 
 // ---------------------------------------------------------------------------
 // Zip helpers
@@ -34,11 +36,25 @@ fn read_zipped_file(file_path: &Path) -> Result<String> {
     let file = std::fs::File::open(file_path)?;
     let mut archive = zip::ZipArchive::new(file)?;
     let mut entry = archive.by_index(0)?;
-    let mut content = String::new();
+    // The zip header records the uncompressed size: allocate once instead of
+    // growing the buffer through repeated doublings while inflating. The
+    // header is unchecked, so a corrupt entry must not be able to request a
+    // huge allocation; past the cap the buffer simply grows as it reads.
+    let hint = entry.size().min(MAX_PREALLOC_BYTES);
+    let mut content = String::with_capacity(usize::try_from(hint).unwrap_or(0));
     entry.read_to_string(&mut content)?;
     Ok(content)
 }
 
+/// Delete `path`, treating an already-missing file as done (one syscall
+/// instead of an `exists()` probe followed by the removal).
+fn remove_if_present(path: &Path) -> std::io::Result<()> {
+    match std::fs::remove_file(path) {
+        Err(e) if e.kind() == std::io::ErrorKind::NotFound => Ok(()),
+        other => other,
+    }
+}
+
 // ---------------------------------------------------------------------------
 // Date parsing from filenames
 // ---------------------------------------------------------------------------
@@ -248,12 +264,8 @@ pub fn save_raw_report_with_delta(
     let base_file = flex_queries_dir.join(format!("base-{date_str}.xml.zip"));
     let delta_file = flex_queries_dir.join(format!("delta-{date_str}.patch.zip"));
 
-    if base_file.exists() {
-        std::fs::remove_file(&base_file)?;
-    }
-    if delta_file.exists() {
-        std::fs::remove_file(&delta_file)?;
-    }
+    remove_if_present(&base_file)?;
+    remove_if_present(&delta_file)?;
 
     let result = get_latest_report_content_any_date(flex_queries_dir);
     let Some((previous_xml, actual_base_file)) = result else {
@@ -298,21 +310,85 @@ pub fn save_raw_report_with_delta(
 
 /// Restore a full XML report for a specific date.
 pub fn restore_report(flex_queries_dir: &Path, report_date: NaiveDate) -> Option<String> {
-    let base_file = find_base_file(flex_queries_dir, report_date)?;
-    let base_content = read_zipped_file(&base_file).ok()?;
+    restore_report_lines(flex_queries_dir, report_date).map(|lines| lines.concat())
+}
+
+/// Restore a report as its lines. Each line keeps its trailing newline,
+/// except the final line when the XML does not end in one.
+///
+/// Lets callers write the report out line by line instead of joining it
+/// into one more full-size copy first.
+fn restore_report_lines(flex_queries_dir: &Path, report_date: NaiveDate) -> Option<Vec<String>> {
+    let (base_file, delta_files) = locate_report(flex_queries_dir, report_date)?;
+    rebuild_lines(&base_file, &delta_files)
+}
+
+/// Apply `delta_files` in order on top of the lines of `base_file`.
+fn rebuild_lines(base_file: &Path, delta_files: &[PathBuf]) -> Option<Vec<String>> {
+    let base_content = read_zipped_file(base_file).ok()?;
     let mut lines: Vec<String> = base_content
         .split_inclusive('\n')
         .map(String::from)
         .collect();
 
-    let base_date = parse_date_from_filename(base_file.file_name()?.to_str()?)?;
-    let delta_files = get_delta_files_between(flex_queries_dir, base_date, report_date);
-
     for df in delta_files {
-        lines = apply_patch(&lines, &df).unwrap_or(lines);
+        lines = apply_patch(&lines, df).unwrap_or(lines);
+    }
+
+    Some(lines)
+}
+
+/// Whether a report can be restored for `report_date`.
+#[must_use]
+pub fn has_report(flex_queries_dir: &Path, report_date: NaiveDate) -> bool {
+    find_base_file(flex_queries_dir, report_date).is_some()
+}
+
+/// Write the report for `report_date` into `sink`; `Ok(false)` if there is
+/// none or it cannot be rebuilt (e.g. an unreadable base), in which case
+/// nothing has been written.
+///
+/// A report stored as a base with no later deltas is copied straight out of
+/// the zip entry, so memory stays at the copy buffer however large the XML
+/// is. Patched reports still need the base lines in memory to apply deltas.
+pub fn restore_report_to<W: Write>(
+    flex_queries_dir: &Path,
+    report_date: NaiveDate,
+    mut sink: W,
+) -> Result<bool> {
+    let Some((base_file, delta_files)) = locate_report(flex_queries_dir, report_date) else {
+        return Ok(false);
+    };
+    if delta_files.is_empty() {
+        // An unreadable base reads as no report, as it does with deltas.
+        let Some(mut archive) = std::fs::File::open(&base_file)
+            .ok()
+            .and_then(|f| zip::ZipArchive::new(f).ok())
+        else {
+            return Ok(false);
+        };
+        let Ok(mut entry) = archive.by_index(0) else {
+            return Ok(false);
+        };
+        std::io::copy(&mut entry, &mut sink)?;
+    } else {
+        let Some(lines) = rebuild_lines(&base_file, &delta_files) else {
+            return Ok(false);
+        };
+        for line in &lines {
+            sink.write_all(line.as_bytes())?;
+        }
     }
+    sink.flush()?;
+    Ok(true)
+}
 
-    Some(lines.join(""))
+/// The base file a report is rebuilt from, plus the deltas to apply on top.
+fn locate_report(dir: &Path, report_date: NaiveDate) -> Option<(PathBuf, Vec<PathBuf>)> {
+    let base_file = find_base_file(dir, report_date)?;
+    let base_date = parse_date_from_filename(base_file.file_name()?.to_str()?)?;
+    let delta_files = get_delta_files_between(dir, base_date, report_date);
+    Some((base_file, delta_files))
 }
 
 /// Remove old base files, keeping only those on or after `keep_date`.
@@ -342,6 +418,22 @@ mod tests {
         assert_eq!(parse_date_from_filename("unknown.zip"), None);
     }
 
+    #[test]
+    fn test_restore_report_lines_concat_to_the_saved_xml() {
+        let dir = tempfile::TempDir::new().unwrap();
+        let date = NaiveDate::from_ymd_opt(2026, 1, 29).unwrap();
+        // No trailing newline: the last line comes back without one.
+        let xml = "<FlexQueryResponse>\n  <Trade price=\"150.50\"/>\n</FlexQueryResponse>";
+        save_raw_report_with_delta(dir.path(), xml, date).unwrap();
+
+        let lines = restore_report_lines(dir.path(), date).unwrap();
+        assert_eq!(lines.concat(), xml);
+        assert_eq!(
+            lines.last().map(String::as_str),
+            Some("</FlexQueryResponse>")
+        );
+    }
+
     #[test]
     fn test_glob_match() {
         assert!(glob_match("base-20260129.xml.zip", "base-*.xml.zip"));
@@ -325,7 +325,7 @@ fn generate_and_save_income(
         force_rates: options.force,
     };
 
-    let mut created = Vec::new();
+    let mut rendered = Vec::new();
     let mut notices = Vec::new();
     for group in &groups {
         let amends = match decide(group, declared.lookup(&group.key), creation_start, today) {
@@ -349,30 +349,7 @@ fn generate_and_save_income(
         };
 
         match render_income_report(group, amends.as_ref(), nbs, config, holidays, &opts) {
-            Ok(report) => {
-                let decl = save_declaration(
-                    storage,
-                    &report.filename,
-                    &report.xml_content,
-                    DeclarationType::Ppo,
-                    report.declaration_date,
-                    report.declaration_date,
-                    &report.entries,
-                    &report.metadata(),
-                    output_dir,
-                )?;
-
-                // A zero credit reads the same in the document whether the
-                // tax was withheld and reversed or never arrived at all;
-                // the log is where the two are told apart.
-                info!(
-                    filename = %report.filename,
-                    matched_any_tax = group.matched_any_tax,
-                    amends = ?report.amends,
-                    "created PP-OPO declaration"
-                );
-                created.push(decl);
-            }
+            Ok(report) => rendered.push((report, group.matched_any_tax)),
             // Running out of holiday data is not a per-group problem:
             // generating with wrong holiday handling is worse than failing.
             Err(e) if e.downcast_ref::<HolidayError>().is_some() => return Err(e),
@@ -384,6 +361,44 @@ fn generate_and_save_income(
         }
     }
 
+    // Every report is rendered (rate lookups included) before
+    // `declarations.json` is touched. Only the saves share one batch, so the
+    // file is held in memory only briefly and a change made elsewhere
+    // meanwhile (the GUI acts on declarations while it syncs) is not
+    // overwritten by a stale snapshot. Gains stay outside: its carryforward
+    // rollback relies on the declaration save failing immediately.
+    let created = storage
+        .with_declarations_batch(|| {
+            rendered
+                .iter()
+                .map(|(report, matched_any_tax)| {
+                    let decl = save_declaration(
+                        storage,
+                        &report.filename,
+                        &report.xml_content,
+                        DeclarationType::Ppo,
+                        report.declaration_date,
+                        report.declaration_date,
+                        &report.entries,
+                        &report.metadata(),
+                        output_dir,
+                    )?;
+
+                    // A zero credit reads the same in the document whether
+                    // the tax was withheld and reversed or never arrived at
+                    // all; the log is where the two are told apart.
+                    info!(
+                        filename = %report.filename,
+                        matched_any_tax,
+                        amends = ?report.amends,
+                        "created PP-OPO declaration"
+                    );
+                    Ok(decl)
+                })
+                .collect::<Result<Vec<_>>>()
+        })
+        .with_context(|| storage.io_error_hint())??;
+
     let empty = created.is_empty() && notices.is_empty();
     Ok(IncomeOutcome {
         created,
@@ -500,29 +515,29 @@ fn save_declaration<T: serde::Serialize>(
     metadata: &indexmap::IndexMap<String, serde_json::Value>,
     output_dir: &Path,
 ) -> Result<Declaration> {
-    let existing = storage.get_declarations(None, None);
-    // max+1, not len+1: after a declaration is deleted from the middle of the
-    // list (delete PP-OPO case) len+1 could collide with a surviving id and
-    // silently overwrite it in `storage.save_declaration`.
-    let next_id = existing
-        .iter()
-        .filter_map(|d| d.declaration_id.parse::<usize>().ok())
-        .max()
-        .unwrap_or(0)
-        + 1;
+    let next_id = storage.next_declaration_id();
     let id_str = next_id.to_string();
     let proper_filename = format!("{next_id:03}-{generator_filename}");
 
     let decl_path = storage.declarations_dir().join(&proper_filename);
     std::fs::write(&decl_path, xml_content).with_context(|| storage.io_error_hint())?;
 
+    // The user's copy is copied from the stored file rather than written
+    // again: `fs::copy` lets the kernel move the bytes (copy_file_range /
+    // clonefile where available). Not a hard link, so editing the exported
+    // file never changes the declaration's own record.
+    // When the output folder is the declarations directory itself the copy
+    // would be onto the same file, which truncates it; the file is already
+    // where the user wants it.
     let output_path = output_dir.join(&proper_filename);
-    std::fs::write(&output_path, xml_content).with_context(|| {
-        format!(
-            "Failed to write to output directory: {}",
-            output_dir.display()
-        )
-    })?;
+    if !is_same_file(&decl_path, &output_path) {
+        std::fs::copy(&decl_path, &output_path).with_context(|| {
+            format!(
+                "Failed to write to output directory: {}",
+                output_dir.display()
+            )
+        })?;
+    }
 
     let report_data: Vec<serde_json::Value> = entries
         .iter()
@@ -551,6 +566,13 @@ fn save_declaration<T: serde::Serialize>(
     Ok(decl)
 }
 
+fn is_same_file(a: &Path, b: &Path) -> bool {
+    match (std::fs::canonicalize(a), std::fs::canonicalize(b)) {
+        (Ok(a), Ok(b)) => a == b,
+        _ => false,
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -1099,6 +1121,30 @@ mod tests {
         assert_eq!(storage.get_declarations(None, None).len(), 3);
     }
 
+    #[test]
+    fn save_declaration_into_declarations_dir_keeps_the_file() {
+        let tmp = tempfile::TempDir::new().unwrap();
+        let storage = Storage::with_dir(tmp.path());
+        let output_dir = storage.declarations_dir().to_path_buf();
+
+        let entries: Vec<serde_json::Value> = Vec::new();
+        let decl = save_declaration(
+            &storage,
+            "ppo-2025-03-10.xml",
+            "<xml/>",
+            DeclarationType::Ppo,
+            NaiveDate::from_ymd_opt(2025, 3, 10).unwrap(),
+            NaiveDate::from_ymd_opt(2025, 3, 10).unwrap(),
+            &entries,
+            &indexmap::IndexMap::new(),
+            &output_dir,
+        )
+        .unwrap();
+
+        let path = decl.file_path.unwrap();
+        assert_eq!(std::fs::read_to_string(path).unwrap(), "<xml/>");
+    }
+
     // -----------------------------------------------------------------
     // Income declaration creation
     // -----------------------------------------------------------------
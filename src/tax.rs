@@ -10,6 +10,9 @@ use crate::nbs::NBSClient;
 
 const FORCE_LOOKBACK_DAYS: u32 = 365;
 
+/// Flat 15% rate for both capital gains (PPDG-3R) and investment income (PP OPO).
+pub const TAX_RATE: Decimal = Decimal::from_parts(15, 0, 0, false, 2);
+
 struct Lot {
     date: NaiveDate,
     price: Decimal,
@@ -22,6 +22,28 @@ fn test_transaction_type_serde() {
     assert_eq!(back, TransactionType::WithholdingTax);
 }
 
+#[test]
+fn test_enum_as_str_matches_serde_name() {
+    for t in [
+        TransactionType::Trade,
+        TransactionType::Dividend,
+        TransactionType::Tax,
+        TransactionType::WithholdingTax,
+        TransactionType::Interest,
+    ] {
+        assert_eq!(serde_json::to_value(&t).unwrap(), t.as_str());
+    }
+    for s in [
+        DeclarationStatus::Draft,
+        DeclarationStatus::Submitted,
+        DeclarationStatus::Pending,
+        DeclarationStatus::Finalized,
+    ] {
+        assert_eq!(serde_json::to_value(s).unwrap(), s.as_str());
+        assert_eq!(s.to_string(), s.as_str());
+    }
+}
+
 #[test]
 fn test_declaration_type_serde() {
     let json = serde_json::to_string(&DeclarationType::Ppdg3r).unwrap();
@@ -173,6 +195,32 @@ fn test_read_declarations_fixture() {
     assert_eq!(ie.sifra_vrste_prihoda, INCOME_CODE_DIVIDEND);
 }
 
+// ---------------------------------------------------------------------------
+// ISO date parsing
+// ---------------------------------------------------------------------------
+
+#[test]
+fn test_parse_iso_date_fixed_width() {
+    assert_eq!(
+        parse_iso_date("2025-06-15"),
+        chrono::NaiveDate::from_ymd_opt(2025, 6, 15)
+    );
+    assert_eq!(parse_iso_date("2025-02-30"), None);
+    assert_eq!(parse_iso_date("2025-0a-15"), None);
+    assert_eq!(parse_iso_date("20250615"), None);
+}
+
+#[test]
+fn test_parse_iso_date_matches_chrono_fallback() {
+    for s in ["2025-6-5", "2024-02-29", "0999-12-31"] {
+        assert_eq!(
+            parse_iso_date(s),
+            chrono::NaiveDate::parse_from_str(s, "%Y-%m-%d").ok(),
+            "{s}"
+        );
+    }
+}
+
 // ---------------------------------------------------------------------------
 // Transaction key and identity
 // ---------------------------------------------------------------------------
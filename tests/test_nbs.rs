@@ -233,3 +233,83 @@ fn test_fallback_mode_allows_missing_year() {
     assert_eq!(rate, Some(dec!(116.50)));
     mock.assert();
 }
+
+// ---------------------------------------------------------------------------
+// Concurrent prefetch
+// ---------------------------------------------------------------------------
+
+#[test]
+fn test_prefetch_rates_fetches_each_pair_once() {
+    let tmp = tempfile::TempDir::new().unwrap();
+    let storage = Storage::with_dir(tmp.path());
+    let cal = calendar();
+
+    // Mon 2025-03-10 .. Fri 2025-03-14, no holidays.
+    let dates: Vec<NaiveDate> = (10..=14)
+        .map(|d| NaiveDate::from_ymd_opt(2025, 3, d).unwrap())
+        .collect();
+    let mut server = mockito::Server::new();
+    let mocks: Vec<_> = dates
+        .iter()
+        .map(|d| {
+            server
+                .mock("GET", format!("/currencies/usd/rates/{d}").as_str())
+                .with_status(200)
+                .with_header("content-type", "application/json")
+                .with_body(r#"{"exchange_middle": 117.5}"#)
+                .expect(1)
+                .create()
+        })
+        .collect();
+
+    let client = NBSClient::with_base_url(&storage, &cal, &server.url());
+    let pairs: Vec<_> = dates.iter().map(|d| (*d, Currency::USD)).collect();
+    client.prefetch_rates(&pairs);
+
+    for m in &mocks {
+        m.assert();
+    }
+    for d in &dates {
+        let cached = storage.get_exchange_rate(*d, &Currency::USD).unwrap();
+        assert_eq!(cached.rate, dec!(117.5));
+    }
+}
+
+#[test]
+fn test_rate_keys_dedupes_and_includes_open_dates() {
+    use ibkr_porez::models::{Transaction, TransactionType};
+    use rust_decimal::Decimal;
+
+    let d = |day| NaiveDate::from_ymd_opt(2025, 3, day).unwrap();
+    let txn = |date, open_date, currency| Transaction {
+        transaction_id: String::new(),
+        date,
+        r#type: TransactionType::Trade,
+        symbol: "ACME".into(),
+        description: String::new(),
+        quantity: Decimal::ONE,
+        price: Decimal::ONE,
+        amount: Decimal::ONE,
+        currency,
+        open_date,
+        open_price: None,
+        exchange_rate: None,
+        amount_rsd: None,
+        action_id: None,
+    };
+    let txns = [
+        txn(d(12), Some(d(3)), Currency::USD),
+        txn(d(12), None, Currency::USD),
+        txn(d(12), None, Currency::EUR),
+        txn(d(3), None, Currency::USD),
+    ];
+
+    assert_eq!(
+        ibkr_porez::nbs::rate_keys(&txns),
+        vec![
+            (d(12), Currency::USD),
+            (d(3), Currency::USD),
+            (d(12), Currency::EUR),
+        ]
+    );
+}
@@ -172,6 +172,37 @@ fn test_storage_rates_roundtrip() {
     );
 }
 
+#[test]
+fn test_storage_rates_batch_writes_once_on_exit() {
+    let dir = TempDir::new().unwrap();
+    let storage = Storage::with_dir(dir.path());
+    let rates_file = dir.path().join("rates.json");
+
+    storage
+        .with_rates_batch(|| {
+            for day in 1..=3 {
+                storage
+                    .save_exchange_rate(&ExchangeRate {
+                        date: d(2025, 6, day),
+                        currency: Currency::USD,
+                        rate: Decimal::from_str("117.25").unwrap(),
+                    })
+                    .unwrap();
+            }
+            assert!(!rates_file.exists(), "writes are deferred inside a batch");
+            assert!(
+                storage
+                    .get_exchange_rate(d(2025, 6, 2), &Currency::USD)
+                    .is_some()
+            );
+        })
+        .unwrap();
+
+    assert!(rates_file.exists());
+    let reopened = Storage::with_dir(dir.path());
+    assert_eq!(reopened.load_rates().len(), 3);
+}
+
 #[test]
 fn test_storage_declarations_roundtrip() {
     let dir = TempDir::new().unwrap();
@@ -225,6 +256,86 @@ fn make_decl(id: &str) -> Declaration {
     }
 }
 
+#[test]
+fn test_declarations_batch_defers_write_until_exit() {
+    let dir = TempDir::new().unwrap();
+    let storage = Storage::with_dir(dir.path());
+    let decl_file = dir.path().join("declarations.json");
+
+    storage
+        .with_declarations_batch(|| {
+            storage.save_declaration(&make_decl("1")).unwrap();
+            storage.save_declaration(&make_decl("2")).unwrap();
+            assert!(!decl_file.exists(), "writes are deferred inside a batch");
+            assert!(storage.declaration_exists("1"));
+        })
+        .unwrap();
+
+    let reopened = Storage::with_dir(dir.path());
+    assert_eq!(reopened.get_declarations(None, None).len(), 2);
+}
+
+#[test]
+fn test_declarations_batch_is_closed_after_panic() {
+    let dir = TempDir::new().unwrap();
+    let storage = Storage::with_dir(dir.path());
+
+    let result = std::panic::catch_unwind(std::panic::AssertUnwindSafe(|| {
+        storage.with_declarations_batch(|| {
+            storage.save_declaration(&make_decl("1")).unwrap();
+            panic!("abort the batch");
+        })
+    }));
+    assert!(result.is_err());
+
+    // The abandoned batch is gone: later writes reach the file directly.
+    storage.save_declaration(&make_decl("2")).unwrap();
+    let reopened = Storage::with_dir(dir.path());
+    let ids: Vec<String> = reopened
+        .get_declarations(None, None)
+        .into_iter()
+        .map(|d| d.declaration_id)
+        .collect();
+    assert_eq!(ids, vec!["2".to_string()]);
+}
+
+#[test]
+fn test_get_declarations_by_status_defaults_missing_status_to_draft() {
+    let dir = TempDir::new().unwrap();
+    let storage = Storage::with_dir(dir.path());
+
+    storage.save_declaration(&make_decl("1")).unwrap();
+    storage
+        .save_declaration(&Declaration {
+            status: DeclarationStatus::Finalized,
+            ..make_decl("2")
+        })
+        .unwrap();
+    storage.save_declaration(&make_decl("3")).unwrap();
+
+    // Legacy records may omit `status`; they load as drafts.
+    let decl_file = dir.path().join("declarations.json");
+    let mut raw: serde_json::Value =
+        serde_json::from_str(&std::fs::read_to_string(&decl_file).unwrap()).unwrap();
+    raw["declarations"][2]
+        .as_object_mut()
+        .unwrap()
+        .remove("status");
+    std::fs::write(&decl_file, raw.to_string()).unwrap();
+
+    let ids = |decls: Vec<Declaration>| -> Vec<String> {
+        decls.into_iter().map(|d| d.declaration_id).collect()
+    };
+    assert_eq!(
+        ids(storage.get_declarations_by_status(|s| s != DeclarationStatus::Finalized)),
+        ["1", "3"]
+    );
+    assert_eq!(
+        ids(storage.get_declarations(Some(&DeclarationStatus::Finalized), None)),
+        ["2"]
+    );
+}
+
 #[test]
 fn test_delete_declaration_removes_target_keeps_others() {
     let dir = TempDir::new().unwrap();
@@ -242,6 +353,20 @@ fn test_delete_declaration_removes_target_keeps_others() {
     assert_eq!(storage.get_declarations(None, None).len(), 2);
 }
 
+#[test]
+fn test_next_declaration_id_is_max_plus_one() {
+    let dir = TempDir::new().unwrap();
+    let storage = Storage::with_dir(dir.path());
+    assert_eq!(storage.next_declaration_id(), 1);
+
+    storage.save_declaration(&make_decl("1")).unwrap();
+    storage.save_declaration(&make_decl("2")).unwrap();
+    storage.save_declaration(&make_decl("3")).unwrap();
+    storage.delete_declaration("2").unwrap();
+
+    assert_eq!(storage.next_declaration_id(), 4);
+}
+
 #[test]
 fn test_delete_declaration_unknown_id_errors() {
     let dir = TempDir::new().unwrap();
@@ -75,6 +75,41 @@ fn test_restore_after_delta() {
     assert!(content.contains("151.00"));
 }
 
+#[test]
+fn test_restore_report_to_matches_restore_report() {
+    let dir = TempDir::new().unwrap();
+    let xml1 = sample_xml(1);
+    storage_flex::save_raw_report_with_delta(dir.path(), &xml1, d(2026, 1, 29)).unwrap();
+    let xml2 = xml1.replace("150.50", "151.00");
+    storage_flex::save_raw_report_with_delta(dir.path(), &xml2, d(2026, 1, 30)).unwrap();
+
+    // Base only (streamed from the zip) and base + delta (patched).
+    for date in [d(2026, 1, 29), d(2026, 1, 30)] {
+        let mut out = Vec::new();
+        assert!(storage_flex::restore_report_to(dir.path(), date, &mut out).unwrap());
+        assert_eq!(
+            Some(String::from_utf8(out).unwrap()),
+            storage_flex::restore_report(dir.path(), date)
+        );
+    }
+
+    let mut out = Vec::new();
+    assert!(!storage_flex::restore_report_to(dir.path(), d(2026, 1, 1), &mut out).unwrap());
+    assert!(out.is_empty());
+    assert!(!storage_flex::has_report(dir.path(), d(2026, 1, 1)));
+}
+
+#[test]
+fn test_restore_report_to_corrupt_base_is_not_found() {
+    let dir = TempDir::new().unwrap();
+    std::fs::write(dir.path().join("base-20260129.xml.zip"), b"not a zip").unwrap();
+
+    assert!(storage_flex::has_report(dir.path(), d(2026, 1, 29)));
+    let mut out = Vec::new();
+    assert!(!storage_flex::restore_report_to(dir.path(), d(2026, 1, 29), &mut out).unwrap());
+    assert!(out.is_empty());
+}
+
 #[test]
 fn test_large_delta_falls_back_to_base() {
     let dir = TempDir::new().unwrap();